@@ -0,0 +1,161 @@
+"""
+Tk helpers shared by the front ends: frame-coalesced render scheduling,
+persistent canvas photos and logging off the Tk thread. Rendering itself
+lives in OrthyApp.image_processing.
+"""
+
+import math
+import time
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from PIL import ImageTk
+
+RENDER_MAX_FPS = 60  # Maximum number of coalesced renders per second
+PHOTO_HEADROOM = 1.25  # Room to spare when a photo has to grow
+
+
+class RenderScheduler:
+    """
+    Coalesces render requests into at most one render per frame. A request
+    marks the scene dirty; the render runs on the next idle callback, or on a
+    timer if the previous frame finished less than one frame interval ago.
+    """
+
+    def __init__(self, widget, render, max_fps=RENDER_MAX_FPS):
+        self.widget = widget
+        self.render = render
+        self.max_fps = max_fps
+        self.pending = None  # Tk callback ID of the scheduled frame
+        self.last_frame_time = 0.0
+        self.stopped = False
+
+        # Statistics
+        self.requests = 0  # Render requests received
+        self.frames = 0  # Renders performed
+        self.merged = 0  # Requests folded into an already scheduled frame
+        self.dropped = 0  # Requests ignored because the scheduler was stopped
+
+    def request(self):
+        """
+        Marks the scene dirty and schedules a render if none is pending.
+        """
+        self.requests += 1
+        if self.stopped:
+            self.dropped += 1
+            return
+        if self.pending is not None:
+            self.merged += 1
+            return
+        delay = self.last_frame_time + 1.0 / self.max_fps - time.perf_counter()
+        if delay <= 0:
+            self.pending = self.widget.after_idle(self.run_frame)
+        else:
+            self.pending = self.widget.after(int(math.ceil(delay * 1000)), self.run_frame)
+
+    def run_frame(self):
+        """
+        Performs the coalesced render.
+        """
+        self.pending = None
+        if self.stopped:
+            return
+        self.last_frame_time = time.perf_counter()
+        self.frames += 1
+        self.render()
+
+    def flush(self):
+        """
+        Renders immediately if a frame is pending.
+        """
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.run_frame()
+
+    def stop(self):
+        """
+        Cancels any pending frame and ignores further requests.
+        """
+        self.stopped = True
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+
+    def stats(self):
+        """
+        Returns the request, frame, merged and dropped counters.
+        """
+        return {
+            'requests': self.requests,
+            'frames': self.frames,
+            'merged': self.merged,
+            'dropped': self.dropped,
+        }
+
+
+class PhotoBuffer:
+    """
+    A persistent Tk photo for one canvas item. New rasters are pasted into it
+    in place; it is only reallocated when a raster is larger than the photo,
+    or much smaller, so a long session does not churn Tk images. Counters are
+    kept in the shared stats dict.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.photo = None
+        self.size = (0, 0)  # Allocated size of the photo
+        self.shown = (0, 0)  # Size of the raster last pasted
+
+    def update(self, img):
+        """
+        Shows img in the photo, anchored at its top-left corner. Returns True
+        if the photo was reallocated, so canvas items must be pointed at it.
+        """
+        width, height = img.size
+        too_small = width > self.size[0] or height > self.size[1]
+        too_large = width * height * 4 < self.size[0] * self.size[1]
+        if self.photo is None or too_small or too_large:
+            if too_small:
+                # Grow with room to spare, so a raster that grows a little each
+                # frame (a rotation, a zoom) settles after a few allocations
+                width = max(math.ceil(width * PHOTO_HEADROOM), self.size[0])
+                height = max(math.ceil(height * PHOTO_HEADROOM), self.size[1])
+            self.photo = ImageTk.PhotoImage("RGBA", (width, height), width=width, height=height)
+            self.size = (width, height)
+            self.stats['allocations'] += 1
+            reallocated = True
+        else:
+            if img.width < self.shown[0] or img.height < self.shown[1]:
+                # Clear what the previous, larger raster left outside the new one
+                self.photo.tk.call(str(self.photo), "blank")
+                self.stats['blanks'] += 1
+            reallocated = False
+        self.photo.paste(img)
+        self.shown = img.size
+        self.stats['pastes'] += 1
+        return reallocated
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queues log records without formatting them, so messages are built on the
+    writer thread instead of the Tk thread. Arguments passed to a logging
+    call must not be changed afterwards.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def start_queue_logging(logger, *handlers):
+    """
+    Routes the logger's records through a queue to the handlers, which run on
+    a background thread so a slow disk never blocks the UI. Returns the
+    listener; stop it on exit to write the remaining records.
+    """
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
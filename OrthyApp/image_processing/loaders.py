@@ -0,0 +1,406 @@
+"""
+Image and SVG loading for the rendering core: cached SVG rasterization,
+reduced-resolution previews of large photos and background preloading of
+templates. Nothing here imports tkinter.
+"""
+
+import io
+import os
+import sys
+import json
+import struct
+import hashlib
+import logging
+import threading
+from importlib import metadata
+from xml.etree import ElementTree
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from PIL import Image
+
+# On-disk cache of rasterized SVG templates (raw RGBA pixels)
+SVG_DISK_CACHE_MAX_PIXELS = 16 * 1000 * 1000  # Larger rasters are not written to disk
+SVG_DISK_CACHE_BUDGET = 512 * 1024 * 1024  # Bytes kept on disk before the oldest entries are pruned
+
+# Bundled templates decoded in the background at startup
+TEMPLATE_PRELOAD_BUDGET = 128 * 1024 * 1024  # Bytes of decoded templates kept ahead of use
+TEMPLATE_PRELOAD_THREADS = 1  # Preloading stays on one thread so it never crowds out rendering
+
+# SVG lengths in CSS pixels per unit, as cairosvg rasterizes them at 96 dpi
+SVG_UNITS = {'': 1.0, 'px': 1.0, 'pt': 96 / 72, 'pc': 16.0, 'mm': 96 / 25.4, 'cm': 96 / 2.54, 'in': 96.0}
+
+
+class SvgConversionError(Exception):
+    """
+    Raised when cairosvg fails to parse or rasterize an SVG file.
+    """
+
+
+def parse_svg(filepath):
+    """
+    Parses an SVG file into a cairosvg tree. cairosvg (and cairo) are only
+    imported when an SVG actually has to be rasterized.
+    """
+    from cairosvg.parser import Tree
+    return Tree(url=filepath)
+
+
+def rasterize_svg_tree(tree, scale=1.0):
+    """
+    Rasterizes a parsed SVG tree at the given scale and returns an RGBA image.
+    """
+    from cairosvg.surface import PNGSurface
+    output = io.BytesIO()
+    surface = PNGSurface(tree, output, 96, scale=scale)
+    surface.finish()
+    output.seek(0)
+    return Image.open(output).convert("RGBA")
+
+
+def default_cache_dir():
+    """
+    Returns the per-user cache directory for the application.
+    """
+    if os.environ.get('ORTHY_CACHE_DIR'):
+        return os.environ['ORTHY_CACHE_DIR']
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'Orthy', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Caches', 'Orthy')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'orthy')
+
+
+def cairosvg_version():
+    """
+    Returns the installed cairosvg version without importing it.
+    """
+    try:
+        return metadata.version('cairosvg')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class SvgDiskCache:
+    """
+    Persistent cache of rasterized SVG templates. Entries are keyed by the SVG
+    content hash, the render scale and the cairosvg version, and stored as raw
+    RGBA pixels, so a warm start loads templates without parsing the SVG or
+    touching cairo. An index remembers each file's (mtime, size, hash), so the
+    content is only re-hashed when stat() shows the file changed; a changed
+    file gets a new hash and therefore new entries.
+    """
+
+    HEADER = struct.Struct('<4sII')  # magic, width, height
+    MAGIC = b'ORGB'
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(default_cache_dir(), 'svg')
+        self.index_path = os.path.join(self.directory, 'index.json')
+        self.version = cairosvg_version()
+        self.lock = threading.Lock()
+        self.index = None  # Loaded on first use
+
+    def load_index(self):
+        if self.index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+        return self.index
+
+    def save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(temp_path, self.index_path)
+
+    def content_hash(self, filepath):
+        """
+        Returns the SHA-256 of the file, reusing the indexed hash while the
+        file's mtime and size are unchanged.
+        """
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        with self.lock:
+            entry = self.load_index().get(path)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                return entry['hash']
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with self.lock:
+            self.index[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}
+            try:
+                self.save_index()
+            except OSError as e:
+                logging.warning(f"Could not write SVG cache index: {e}")
+        return digest
+
+    def entry_path(self, filepath, scale):
+        digest = self.content_hash(filepath)
+        return os.path.join(self.directory, f"{digest[:40]}_x{scale:g}_cairosvg-{self.version}.rgba")
+
+    def load(self, filepath, scale=1.0):
+        """
+        Returns the cached raster for the SVG at scale, or None on a miss.
+        """
+        try:
+            with open(self.entry_path(filepath, scale), 'rb') as f:
+                data = f.read()
+            magic, width, height = self.HEADER.unpack_from(data)
+            if magic != self.MAGIC or len(data) != self.HEADER.size + width * height * 4:
+                return None
+            return Image.frombytes('RGBA', (width, height), data[self.HEADER.size:])
+        except (OSError, struct.error):
+            return None
+
+    def store(self, filepath, scale, image):
+        """
+        Writes a raster to the cache. Rasters over SVG_DISK_CACHE_MAX_PIXELS
+        are skipped.
+        """
+        if image.width * image.height > SVG_DISK_CACHE_MAX_PIXELS:
+            return
+        try:
+            path = self.entry_path(filepath, scale)
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, image.width, image.height))
+                f.write(image.convert('RGBA').tobytes())
+            os.replace(temp_path, path)
+            self.prune()
+        except OSError as e:
+            logging.warning(f"Could not write SVG cache entry for '{filepath}': {e}")
+
+    def prune(self):
+        """
+        Deletes the least recently written entries while the cache is over
+        SVG_DISK_CACHE_BUDGET.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.rgba'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= SVG_DISK_CACHE_BUDGET:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+
+svg_disk_cache = SvgDiskCache()
+
+
+def rasterize_svg(filepath, scale=1.0, tree=None):
+    """
+    Returns the SVG rasterized at scale, from the disk cache when possible.
+    A parsed tree can be passed to avoid re-parsing the file on a miss.
+    cairosvg failures are raised as SvgConversionError.
+    """
+    image = svg_disk_cache.load(filepath, scale)
+    if image is None:
+        if tree is None and not os.path.exists(filepath):
+            raise FileNotFoundError(filepath)
+        try:
+            image = rasterize_svg_tree(tree or parse_svg(filepath), scale)
+        except ImportError:
+            raise
+        except Exception as e:
+            raise SvgConversionError(e) from e
+        svg_disk_cache.store(filepath, scale, image)
+    return image
+
+
+def open_reduced(filepath, max_size):
+    """
+    Opens an image at a reduced resolution that still covers max_size, for a
+    quick preview. JPEGs are decoded at 1/2, 1/4 or 1/8 scale with draft();
+    other formats are decoded and then reduced by an integer factor.
+    Returns the RGBA preview and the full-resolution size.
+    """
+    image = Image.open(filepath)
+    full_size = image.size
+    image.draft("RGB", max_size)
+    factor = int(min(image.width / max_size[0], image.height / max_size[1]))
+    if factor >= 2:
+        if image.mode not in ("L", "LA", "RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image = image.reduce(factor)
+    return image.convert("RGBA"), full_size
+
+
+def svg_size(filepath):
+    """
+    Returns the pixel size an SVG rasterizes to at scale 1, read from the
+    width and height of its root element, or from its viewBox when they are
+    missing or relative. Returns None if neither gives a size.
+    """
+    for _, element in ElementTree.iterparse(filepath, events=('start',)):
+        view_box = (element.get('viewBox') or '').replace(',', ' ').split()
+        size = []
+        for index, attribute in enumerate(('width', 'height')):
+            value = (element.get(attribute) or '').strip()
+            number = value.rstrip('abcdefghijklmnopqrstuvwxyz%')
+            unit = value[len(number):]
+            try:
+                if number and unit in SVG_UNITS:
+                    size.append(float(number) * SVG_UNITS[unit])
+                else:
+                    size.append(float(view_box[index + 2]))
+            except (ValueError, IndexError):
+                return None
+        return size
+    return None
+
+
+def estimate_decoded_bytes(filepath):
+    """
+    Estimates the memory taken by the RGBA decode of an image without
+    decoding it. Returns 0 when the size cannot be read.
+    """
+    try:
+        if filepath.lower().endswith('.svg'):
+            size = svg_size(filepath)
+        else:
+            with Image.open(filepath) as image:
+                size = image.size
+    except (OSError, ElementTree.ParseError, Image.DecompressionBombError):
+        return 0
+    if not size:
+        return 0
+    return int(size[0] + 0.5) * int(size[1] + 0.5) * 4
+
+
+class TemplatePreloader:
+    """
+    Decodes the bundled templates in the background so the first toggle of a
+    template does not block the UI. Templates are decoded most-used first,
+    using the usage counts saved by previous sessions, until the memory
+    budget is spent; the rest are decoded on demand. A request for a template
+    that is still being decoded waits for that decode instead of starting a
+    second one.
+    """
+
+    def __init__(self, load, filepaths, usage_path, memory_budget=TEMPLATE_PRELOAD_BUDGET):
+        self.load = load  # Called as load(filepath) on a preload thread; returns an image or None
+        self.filepaths = list(filepaths)
+        self.usage_path = usage_path
+        self.memory_budget = memory_budget
+        self.executor = ThreadPoolExecutor(max_workers=TEMPLATE_PRELOAD_THREADS, thread_name_prefix="TemplatePreload")
+        self.lock = threading.Lock()
+        self.futures = {}  # filepath -> Future of the decoded image, until it is handed out
+        self.reserved = {}  # filepath -> bytes counted against the budget
+        self.bytes_used = 0
+        self.usage = self.load_usage()
+
+        # Statistics
+        self.hits = 0  # Requests served by a finished preload
+        self.waits = 0  # Requests served by waiting for a preload in flight
+        self.misses = 0  # Requests decoded on demand
+
+    def load_usage(self):
+        try:
+            with open(self.usage_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_usage(self):
+        try:
+            os.makedirs(os.path.dirname(self.usage_path), exist_ok=True)
+            with open(self.usage_path, 'w', encoding='utf-8') as f:
+                json.dump(self.usage, f)
+        except OSError as e:
+            logging.warning(f"Could not save template usage: {e}")
+
+    def start(self):
+        """
+        Queues every template for decoding, most frequently used first.
+        """
+        order = sorted(self.filepaths, key=lambda path: -self.usage.get(os.path.basename(path), 0))
+        with self.lock:
+            for filepath in order:
+                if filepath not in self.futures and os.path.exists(filepath):
+                    self.futures[filepath] = self.executor.submit(self.preload, filepath)
+
+    def preload(self, filepath):
+        """
+        Decodes one template if its estimated size still fits the budget. The
+        estimate is reserved before decoding and replaced by the actual size
+        afterwards.
+        """
+        estimate = estimate_decoded_bytes(filepath)
+        with self.lock:
+            if self.bytes_used + estimate > self.memory_budget:
+                return None
+            self.bytes_used += estimate
+            self.reserved[filepath] = estimate
+        image = None
+        try:
+            image = self.load(filepath)
+            return image
+        finally:
+            actual = image.width * image.height * len(image.getbands()) if image is not None else 0
+            with self.lock:
+                self.bytes_used += actual - estimate
+                self.reserved[filepath] = actual
+
+    def get(self, filepath):
+        """
+        Returns the decoded template, waiting for a preload in flight or
+        decoding it now if it was never preloaded. A preload still queued
+        behind others is cancelled and decoded here instead, so the caller
+        never waits for unrelated templates. A preloaded image is handed out
+        once; the preloader keeps no reference to it afterwards.
+        """
+        name = os.path.basename(filepath)
+        with self.lock:
+            self.usage[name] = self.usage.get(name, 0) + 1
+            future = self.futures.pop(filepath, None)
+        image = None
+        finished = False
+        if future is not None and future.cancel():
+            # Not started yet; nothing was reserved for it
+            future = None
+        if future is not None and not future.cancelled():
+            finished = future.done()
+            try:
+                image = future.result()
+            except CancelledError:
+                image = None
+            except Exception as e:
+                logging.error(f"Error preloading template '{filepath}': {e}")
+                image = None
+            with self.lock:
+                self.bytes_used -= self.reserved.pop(filepath, 0)
+        if image is not None:
+            if finished:
+                self.hits += 1
+            else:
+                self.waits += 1
+            return image
+        self.misses += 1
+        return self.load(filepath)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'waits': self.waits,
+            'misses': self.misses,
+            'bytes_used': self.bytes_used,
+        }
+
+    def stop(self):
+        """
+        Cancels queued decodes and saves the usage counts for the next start.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            self.futures.clear()
+        self.save_usage()
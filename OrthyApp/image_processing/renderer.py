@@ -0,0 +1,217 @@
+"""
+Frame rendering for the rendering core: renders layer rasters through their
+render caches and blends placed rasters into a single RGBA frame. Nothing here
+imports tkinter, so it runs and benchmarks on a headless machine.
+"""
+
+import logging
+
+try:
+    import numpy as np  # Optional; only needed to blend layers into one frame
+except ImportError:
+    np = None
+from PIL import Image
+
+from .transformations import SETTLED_RESAMPLE
+
+NUMPY_AVAILABLE = np is not None
+
+
+def render_cached(layer, key):
+    """
+    Returns the raster for a render key from the layer's render cache,
+    rendering and caching it on a miss. Safe to call from render threads.
+    """
+    # One lookup: the Tk thread may clear the cache between two
+    raster = layer.render_cache.get(key)
+    if raster is None:
+        raster = layer.render(key)
+        layer.render_cache.put(key, raster)
+    return raster
+
+
+def render_job(layer, key):
+    """
+    Renders one (layer, key) job through render_cached. Returns None, after
+    logging the error, if the render raises.
+    """
+    try:
+        return render_cached(layer, key)
+    except Exception as e:
+        logging.error(f"Error rendering image '{layer.name}': {e}")
+        return None
+
+
+def render_jobs(jobs, executor=None):
+    """
+    Renders (layer, key) jobs, concurrently on the executor if one is given.
+    Returns one (raster, left, top) per job, in job order, or None for a job
+    whose render failed.
+    """
+    if executor is None:
+        return [render_job(layer, key) for layer, key in jobs]
+    return list(executor.map(render_job, *zip(*jobs))) if jobs else []
+
+
+def render_layers(layers, viewport=None, resample=SETTLED_RESAMPLE, executor=None):
+    """
+    Renders the visible layers, bottom first, clipped to the viewport when one
+    is given. Returns one (raster, x, y) per rendered layer, placed at its
+    integer canvas position.
+    """
+    jobs = [(layer, layer.render_key(resample, viewport)) for layer in layers if layer.visible]
+    placed = []
+    for (layer, key), raster in zip(jobs, render_jobs(jobs, executor)):
+        if raster is None:
+            continue
+        img, left, top = raster
+        x, y = layer.raster_position(key[2], left, top)
+        placed.append((img, round(x), round(y)))
+    return placed
+
+
+def render_frame(layers, viewport, resample=SETTLED_RESAMPLE, executor=None, compositor=None):
+    """
+    Renders the visible layers and blends them into one frame with the
+    compositor. Returns (frame, left, top), or None if nothing is inside the
+    viewport. Requires NumPy.
+    """
+    compositor = compositor or FrameCompositor()
+    return compositor.compose(render_layers(layers, viewport, resample, executor), viewport)
+
+
+def flatten_layers(layers, viewport):
+    """
+    Blends (image, x, y) layers, bottom first, into one straight-alpha RGBA
+    image clipped to the viewport. Returns (image, left, top), or None if no
+    layer is inside the viewport. Uses Pillow only, so it works without NumPy.
+    """
+    if not layers:
+        return None
+    left = max(viewport[0], min(x for _, x, _ in layers))
+    top = max(viewport[1], min(y for _, _, y in layers))
+    right = min(viewport[2], max(x + image.width for image, x, _ in layers))
+    bottom = min(viewport[3], max(y + image.height for image, _, y in layers))
+    if right <= left or bottom <= top:
+        return None
+    flat = Image.new("RGBA", (right - left, bottom - top))
+    for image, x, y in layers:
+        # alpha_composite() takes no negative destination, so crop the source instead
+        dest_x, dest_y = x - left, y - top
+        source_x, source_y = max(-dest_x, 0), max(-dest_y, 0)
+        if source_x >= image.width or source_y >= image.height:
+            continue
+        flat.alpha_composite(image.convert("RGBA"), (max(dest_x, 0), max(dest_y, 0)), (source_x, source_y))
+    return flat, left, top
+
+
+class FrameCompositor:
+    """
+    Blends layer rasters into a single RGBA frame, so the canvas shows one
+    image per frame instead of one transparent image per layer. Layers are
+    combined with the premultiplied-alpha "over" operator in NumPy, only over
+    the region the layers cover. Layers that do not change can be flattened
+    once into a premultiplied block and passed to compose() as one layer.
+    Requires NumPy.
+    """
+
+    def __init__(self):
+        self.frames = 0  # Frames composited
+        self.flattened = 0  # Layer groups flattened
+        self.pixels = 0  # Layer pixels blended
+
+    @staticmethod
+    def layer_size(layer):
+        if isinstance(layer, np.ndarray):
+            return layer.shape[1], layer.shape[0]
+        return layer.size
+
+    def covered_box(self, layers, viewport):
+        """
+        Returns the part of the viewport covered by the layers, or None.
+        """
+        if not layers:
+            return None
+        boxes = []
+        for layer, x, y in layers:
+            width, height = self.layer_size(layer)
+            boxes.append((x, y, x + width, y + height))
+        left = max(viewport[0], min(box[0] for box in boxes))
+        top = max(viewport[1], min(box[1] for box in boxes))
+        right = min(viewport[2], max(box[2] for box in boxes))
+        bottom = min(viewport[3], max(box[3] for box in boxes))
+        if right <= left or bottom <= top:
+            return None
+        return left, top, right, bottom
+
+    def blend_all(self, layers, box):
+        """
+        Returns the premultiplied float32 blend of the layers over box; alpha
+        stays in 0..255.
+        """
+        left, top, right, bottom = box
+        frame = np.zeros((bottom - top, right - left, 4), dtype=np.float32)
+        for layer, x, y in layers:
+            self.blend(frame, layer, x - left, y - top)
+        return frame
+
+    def flatten(self, layers, viewport):
+        """
+        Blends (image, x, y) layers into a premultiplied block that compose()
+        accepts in place of the layers. Returns (block, left, top) or None.
+        """
+        box = self.covered_box(layers, viewport)
+        if box is None:
+            return None
+        self.flattened += 1
+        return self.blend_all(layers, box), box[0], box[1]
+
+    def compose(self, layers, viewport):
+        """
+        Blends (image, x, y) layers, bottom first, clipped to the viewport
+        (left, top, right, bottom). A layer may also be a block returned by
+        flatten(). Returns the frame and its top-left canvas position, or
+        None if no layer is inside the viewport.
+        """
+        box = self.covered_box(layers, viewport)
+        if box is None:
+            return None
+        frame = self.blend_all(layers, box)
+
+        # Back to straight alpha for Tk
+        alpha = frame[..., 3:]
+        np.multiply(frame[..., :3], 255 / np.maximum(alpha, 1e-3), out=frame[..., :3])
+        np.clip(frame, 0, 255, out=frame)
+        frame += 0.5
+        out = frame.astype(np.uint8)
+        self.frames += 1
+        return Image.frombuffer("RGBA", (out.shape[1], out.shape[0]), out, "raw", "RGBA", 0, 1), box[0], box[1]
+
+    def blend(self, frame, layer, x, y):
+        """
+        Composites a straight-alpha RGBA image, or a premultiplied block, over
+        the frame at (x, y).
+        """
+        height, width = frame.shape[:2]
+        layer_width, layer_height = self.layer_size(layer)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + layer_width, width), min(y + layer_height, height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        target = frame[y0:y1, x0:x1]
+        if isinstance(layer, np.ndarray):
+            source = layer[y0 - y:y1 - y, x0 - x:x1 - x]
+            target *= 1 - source[..., 3:] * (1 / 255)
+            target += source
+        else:
+            # Pillow exposes the pixels to NumPy as a read-only array; only the
+            # visible part is converted to float
+            source = np.asarray(layer.convert("RGBA"))[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.float32)
+            coverage = source[..., 3:] * (1 / 255)
+            target *= 1 - coverage
+            target[..., :3] += source[..., :3] * coverage
+            target[..., 3:] += source[..., 3:]
+        self.pixels += (x1 - x0) * (y1 - y0)
+
+    def stats(self):
+        return {'frames': self.frames, 'flattened': self.flattened, 'pixels': self.pixels}
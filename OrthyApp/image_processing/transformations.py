@@ -0,0 +1,701 @@
+"""
+Layer state and transformations for the rendering core. A LayerState holds
+one image with its transform and renders rasters for it: scale, flips and
+rotation are composed into one affine resample from a downsampled pyramid
+level or a vector raster, clipped to the viewport and cached. Nothing here
+imports tkinter.
+"""
+
+import math
+import time
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from PIL import Image, ImageStat
+
+from .loaders import parse_svg, rasterize_svg_tree, svg_disk_cache
+
+# Render cache settings
+RENDER_CACHE_SIZE = 24      # Maximum number of cached rasters per image
+RENDER_CACHE_BUDGET = 128 * 1024 * 1024  # Bytes of cached rasters per image (RGBA size)
+SCALE_QUANTUM = 0.001       # Scale step used when building cache keys
+ANGLE_QUANTUM = 0.05        # Angle step (degrees) used when building cache keys
+TRANSPARENCY_VARIANTS = 4   # Maximum number of cached transparency variants per image
+
+# Resampling filters: a cheap one while input is active, a high-quality one
+# once it has settled
+INTERACTIVE_RESAMPLE = Image.BILINEAR  # Image.NEAREST is faster still
+SETTLED_RESAMPLE = Image.BICUBIC
+
+# SVG templates are re-rasterized from the vector source at power-of-two
+# scale buckets when zoomed in, up to this many pixels per raster
+SVG_MAX_PIXELS = 40 * 1000 * 1000
+SVG_RASTER_BUCKETS = 2  # Number of vector rasters kept per image
+
+# Layers larger than the viewport are only rendered where visible. The visible
+# box is grown by a margin and snapped to a grid so small pans reuse the raster.
+CLIP_GRID = 128  # Pixels
+CLIP_MARGIN = 256  # Pixels rendered beyond each edge of the viewport
+
+# Transparent margins are trimmed at load. The kept box snaps outwards to this
+# grid so the downsampled pyramid levels keep the same pixel phase.
+TRIM_ALIGN = 32  # Pixels
+
+# Large photos render clipped views from fixed-size output tiles kept in an LRU
+# cache, so a pan only resamples the newly exposed tiles
+TILED_MIN_PIXELS = 16 * 1000 * 1000  # Sources at least this large are tiled
+TILE_SIZE = 256  # Pixels
+TILE_CACHE_SIZE = 256  # Tiles kept per image (64 MB at 256 px)
+
+
+class RasterCache:
+    """
+    Small LRU cache of rendered rasters for a single image. Entries are keyed on
+    the quantized transformation parameters so that repeated states are a lookup
+    instead of a full re-rasterization. The cache is bounded by entry count and
+    by the RGBA size of its rasters; the newest entry is always kept. Values
+    are images or (image, left, top) tuples. Safe to use from the render worker.
+    """
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE, max_bytes=RENDER_CACHE_BUDGET):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def value_bytes(value):
+        image = value[0] if isinstance(value, tuple) else value
+        return image.width * image.height * 4
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def get(self, key):
+        """
+        Returns the cached raster for the key, or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, image):
+        """
+        Stores a raster, evicting the least recently used entries over the
+        entry cap or the byte budget.
+        """
+        size = self.value_bytes(image)
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self.entries[key] = (image, size)
+            self.bytes += size
+            while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops all cached rasters. Hit/miss counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """
+        Returns the hit/miss/eviction counters and current size of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def quantize(value, step):
+    """
+    Rounds a value to the nearest multiple of step.
+    """
+    return round(round(value / step) * step, 6)
+
+
+@lru_cache(maxsize=32)
+def transparency_table(level):
+    """
+    Returns the 256-entry lookup table that scales an alpha channel by level.
+    """
+    return [int(p * level) for p in range(256)]
+
+
+def single_colour(image):
+    """
+    Returns the (r, g, b) colour shared by every visible pixel of an RGBA
+    image, or None if the image has more than one colour.
+    """
+    if image.mode != "RGBA":
+        return None
+    *rgb_extrema, (alpha_min, alpha_max) = image.getextrema()
+    if all(low == high for low, high in rgb_extrema):
+        return tuple(low for low, _ in rgb_extrema)
+    if alpha_min == 255 or alpha_max == 0:
+        return None
+    # Transparent pixels may hold any colour; only compare the visible ones
+    visible = image.getchannel("A").point(lambda a: 255 if a else 0)
+    extrema = ImageStat.Stat(image.convert("RGB"), visible).extrema
+    if all(low == high for low, high in extrema):
+        return tuple(int(low) for low, _ in extrema)
+    return None
+
+
+def scale_alpha(image, level):
+    """
+    Returns a copy of an RGBA image, or an alpha mask, with its alpha
+    scaled by level.
+    """
+    if image.mode == "L":
+        return image.point(transparency_table(level))
+    red, green, blue, alpha = image.split()
+    return Image.merge("RGBA", (red, green, blue, alpha.point(transparency_table(level))))
+
+
+class AffineTransform:
+    """
+    A 2x3 affine matrix mapping (x, y) to (a*x + b*y + c, d*x + e*y + f).
+    Used to compose scale, flip, rotation and translation into a single
+    transform so images are resampled once per render.
+    """
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=0.0, e=1.0, f=0.0):
+        self.matrix = (a, b, c, d, e, f)
+
+    @classmethod
+    def translation(cls, dx, dy):
+        return cls(1.0, 0.0, dx, 0.0, 1.0, dy)
+
+    @classmethod
+    def scaling(cls, sx, sy):
+        return cls(sx, 0.0, 0.0, 0.0, sy, 0.0)
+
+    @classmethod
+    def rotation(cls, angle):
+        """
+        Counterclockwise rotation on screen (y axis pointing down), matching
+        the direction of Image.rotate.
+        """
+        radians = math.radians(angle)
+        cos_a = round(math.cos(radians), 15)
+        sin_a = round(math.sin(radians), 15)
+        return cls(cos_a, sin_a, 0.0, -sin_a, cos_a, 0.0)
+
+    def then(self, other):
+        """
+        Returns the transform that applies this transform first, then other.
+        """
+        a1, b1, c1, d1, e1, f1 = self.matrix
+        a2, b2, c2, d2, e2, f2 = other.matrix
+        return AffineTransform(
+            a2 * a1 + b2 * d1, a2 * b1 + b2 * e1, a2 * c1 + b2 * f1 + c2,
+            d2 * a1 + e2 * d1, d2 * b1 + e2 * e1, d2 * c1 + e2 * f1 + f2
+        )
+
+    def apply(self, x, y):
+        a, b, c, d, e, f = self.matrix
+        return a * x + b * y + c, d * x + e * y + f
+
+    def inverse(self):
+        a, b, c, d, e, f = self.matrix
+        det = a * e - b * d
+        if det == 0:
+            raise ValueError("Affine transform is not invertible.")
+        return AffineTransform(
+            e / det, -b / det, (b * f - c * e) / det,
+            -d / det, a / det, (c * d - a * f) / det
+        )
+
+    def bounds(self, x0, y0, x1, y1):
+        """
+        Returns the integer bounding box (left, top, right, bottom) of the
+        rectangle (x0, y0, x1, y1) after transformation.
+        """
+        points = [self.apply(x, y) for x, y in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))]
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        # Round before floor/ceil so float noise does not add an empty row/column
+        return (
+            math.floor(round(min(xs), 6)), math.floor(round(min(ys), 6)),
+            math.ceil(round(max(xs), 6)), math.ceil(round(max(ys), 6))
+        )
+
+
+def build_layer_transform(width, height, scale, angle, flip_h, flip_v):
+    """
+    Builds the transform from source pixel coordinates to raster coordinates.
+    The source is centered on the origin, scaled, flipped and rotated about
+    its center. A rotation point only moves the result (see pivot_shift), so
+    it is applied when the raster is placed, not here.
+    """
+    return (
+        AffineTransform.translation(-width / 2, -height / 2)
+        .then(AffineTransform.scaling(-scale if flip_h else scale, -scale if flip_v else scale))
+        .then(AffineTransform.rotation(angle))
+    )
+
+
+def pivot_shift(pivot, angle):
+    """
+    Returns the translation that turns a rotation about the center into a
+    rotation about the pivot (relative to the center): pivot - R(pivot).
+    """
+    if not pivot:
+        return 0.0, 0.0
+    x, y = AffineTransform.rotation(angle).apply(*pivot)
+    return pivot[0] - x, pivot[1] - y
+
+
+class LayerState:
+    """
+    Represents the state of an individual image, including its transformations
+    and visibility settings, and renders its rasters. Front ends keep their
+    display state (canvas items, photos) in a subclass.
+    """
+
+    def __init__(self, image_original, name, source_path=None, size=None):
+        # Single-colour line art is kept as an alpha mask plus its colour; the
+        # pipeline resamples one channel and the colour is applied at the end
+        self.tint = single_colour(image_original)
+        if self.tint is not None:
+            image_original = image_original.getchannel("A")
+        # Full-resolution size. While a reduced preview is loaded it is larger
+        # than image_original, and rendering scales the preview up to it.
+        self.size = tuple(size) if size else image_original.size
+        self.preview = self.size != image_original.size
+        # Transparent margins are cropped away; content_box is where the
+        # remaining pixels sit in the full-resolution image
+        self.image_original, self.content_box = self.trim(image_original)
+        self.name = name
+        self.visible = True
+
+        # Vector source for SVG images; re-rasterized at the zoom level in scale buckets
+        self.svg_path = source_path if source_path and source_path.lower().endswith('.svg') else None
+        self.svg_tree = None  # Parsed lazily on the vector render thread
+        self.svg_rasters = OrderedDict()  # bucket -> RGBA raster
+
+        # Transformation properties
+        self.angle = 0
+        self.scale = 1.0
+        self.scale_log = 0
+        self.offset_x = 512
+        self.offset_y = 512
+        self.rotation_point = None
+
+        # Flip properties
+        self.is_flipped_horizontally = False
+        self.is_flipped_vertically = False
+
+        # Transparency
+        self.image_transparency_level = 0.2  # Set to minimum transparency by default
+
+        # Cache of rendered rasters keyed on the transformation parameters
+        self.render_cache = RasterCache()
+
+        # Large photos are assembled from cached output tiles when clipped
+        self.tiled = self.size[0] * self.size[1] >= TILED_MIN_PIXELS
+        self.tile_cache = RasterCache(TILE_CACHE_SIZE) if self.tiled else None
+
+        # Power-of-two pyramid of downsampled sources, built on demand.
+        # Level 0 is the original; level k is 1 / 2**k of its size.
+        self.pyramid = {0: self.image_original}
+        self.pyramid_last_used = {}
+
+        # Guards the pyramid and transparency variants, which the render worker builds
+        self.lock = threading.RLock()
+
+        # Sources with the alpha channel pre-scaled, keyed on (source, transparency level)
+        self.transparency_variants = OrderedDict()
+
+    def trim(self, image):
+        """
+        Crops a source to its non-transparent pixels. Returns the crop and its
+        box in full-resolution coordinates, so offsets, pivots and picking
+        still refer to the untrimmed image.
+        """
+        width, height = self.size
+        alpha = image if image.mode == "L" else image.getchannel("A")
+        bbox = alpha.getbbox()
+        if bbox is None:
+            return image, (0, 0, width, height)
+        bbox = (
+            bbox[0] // TRIM_ALIGN * TRIM_ALIGN, bbox[1] // TRIM_ALIGN * TRIM_ALIGN,
+            min(-(-bbox[2] // TRIM_ALIGN) * TRIM_ALIGN, image.width),
+            min(-(-bbox[3] // TRIM_ALIGN) * TRIM_ALIGN, image.height)
+        )
+        if bbox == (0, 0, image.width, image.height):
+            return image, (0, 0, width, height)
+        scale_x = width / image.width
+        scale_y = height / image.height
+        return image.crop(bbox), (bbox[0] * scale_x, bbox[1] * scale_y, bbox[2] * scale_x, bbox[3] * scale_y)
+
+    def vector_bucket_for_scale(self, scale):
+        """
+        Returns the power-of-two scale bucket at which an SVG image should be
+        re-rasterized for the given zoom level, or None if the bitmap is enough.
+        """
+        if self.svg_path is None or scale <= 1.0:
+            return None
+        bucket = 2 ** int(math.ceil(math.log2(scale) - 1e-9))
+        pixels = self.size[0] * self.size[1]
+        while bucket > 1 and pixels * bucket * bucket > SVG_MAX_PIXELS:
+            bucket //= 2
+        return bucket if bucket > 1 else None
+
+    def has_vector_raster(self, bucket):
+        with self.lock:
+            return bucket in self.svg_rasters
+
+    def vector_raster(self, bucket):
+        """
+        Returns the SVG rasterized at the bucket scale, loading it from the
+        disk cache or rendering it from the parsed tree if needed.
+        Runs on the vector render thread.
+        """
+        with self.lock:
+            image = self.svg_rasters.get(bucket)
+            if image is not None:
+                self.svg_rasters.move_to_end(bucket)
+                return image
+        image = svg_disk_cache.load(self.svg_path, bucket)
+        if image is None:
+            if self.svg_tree is None:
+                self.svg_tree = parse_svg(self.svg_path)
+            image = rasterize_svg_tree(self.svg_tree, bucket)
+            svg_disk_cache.store(self.svg_path, bucket, image)
+        if self.tint is not None:
+            image = image.getchannel("A")
+        # Crop to the same content as the trimmed bitmap
+        image = image.crop(tuple(round(v * bucket) for v in self.content_box))
+        with self.lock:
+            self.svg_rasters[bucket] = image
+            while len(self.svg_rasters) > SVG_RASTER_BUCKETS:
+                evicted, _ = self.svg_rasters.popitem(last=False)
+                self.drop_transparency_variants(('svg', evicted))
+        return image
+
+    def source_for_scale(self, scale):
+        """
+        Returns the source to resample from for a zoom level: a crisp vector
+        raster when one is ready, otherwise the nearest pyramid level.
+        """
+        bucket = self.vector_bucket_for_scale(scale)
+        if bucket is not None and self.has_vector_raster(bucket):
+            return ('svg', bucket)
+        return ('preview' if self.preview else 'pyramid', self.pyramid_level_for_scale(scale))
+
+    def source_image(self, source):
+        """
+        Returns the image for a source returned by source_for_scale. The
+        preview and the full-resolution image share the pyramid; the kinds
+        only keep their rasters apart in the caches.
+        """
+        kind, level = source
+        if kind == 'svg':
+            return self.vector_raster(level)
+        return self.pyramid_image(level)
+
+    def drop_transparency_variants(self, source):
+        with self.lock:
+            for key in [key for key in self.transparency_variants if key[0] == source]:
+                del self.transparency_variants[key]
+
+    def pyramid_level_for_scale(self, scale):
+        """
+        Returns the smallest pyramid level that is still at least as large as
+        the target scale, so only a residual downscale is left to resample.
+        """
+        # Relative to the pixels actually loaded, which a preview has fewer of
+        scale *= (self.content_box[2] - self.content_box[0]) / self.image_original.width
+        if scale >= 1.0:
+            return 0
+        level = int(math.floor(math.log2(1.0 / scale) + 1e-9))
+        # Never go below a couple of pixels on the short side
+        max_level = max(int(math.log2(max(min(self.image_original.size), 1))) - 1, 0)
+        return min(level, max_level)
+
+    def pyramid_image(self, level):
+        """
+        Returns the source at the given pyramid level, building any missing
+        levels by halving the level above.
+        """
+        with self.lock:
+            image = self.pyramid.get(level)
+            if image is None:
+                image = self.pyramid_image(level - 1).reduce(2)
+                self.pyramid[level] = image
+            self.pyramid_last_used[level] = time.monotonic()
+            return image
+
+    def pyramid_bytes(self):
+        """
+        Returns the memory used by the downsampled pyramid levels.
+        """
+        with self.lock:
+            return sum(
+                image.width * image.height * len(image.getbands())
+                for level, image in self.pyramid.items() if level > 0
+            )
+
+    def evict_pyramid_level(self, level):
+        """
+        Drops a downsampled level and its transparency variants. It is rebuilt
+        on demand the next time it is needed.
+        """
+        if level == 0:
+            return
+        with self.lock:
+            self.pyramid.pop(level, None)
+            self.pyramid_last_used.pop(level, None)
+            self.drop_transparency_variants(('preview' if self.preview else 'pyramid', level))
+
+    def replace_original(self, image):
+        """
+        Swaps the preview for the full-resolution decode and drops everything
+        built from the preview. Runs on the main thread.
+        """
+        if self.tint is not None:
+            image = image.getchannel("A")
+        with self.lock:
+            self.preview = False
+            self.image_original, self.content_box = self.trim(image)
+            self.pyramid = {0: self.image_original}
+            self.pyramid_last_used = {}
+            self.transparency_variants.clear()
+        self.render_cache.clear()
+        if self.tile_cache is not None:
+            self.tile_cache.clear()
+
+    def transparency_variant(self, level, source=('pyramid', 0)):
+        """
+        Returns a source image with its alpha scaled by level. Variants are
+        built once and kept, so switching transparency is a lookup, and they
+        are built from the downsampled level, not the full image.
+        """
+        with self.lock:
+            image = self.source_image(source)
+            if level >= 1.0:
+                return image
+            key = (source, level)
+            variant = self.transparency_variants.get(key)
+            if variant is None:
+                variant = scale_alpha(image, level)
+                self.transparency_variants[key] = variant
+                while len(self.transparency_variants) > TRANSPARENCY_VARIANTS:
+                    self.transparency_variants.popitem(last=False)
+            else:
+                self.transparency_variants.move_to_end(key)
+            return variant
+
+    def render_key(self, resample=SETTLED_RESAMPLE, viewport=None):
+        """
+        Builds the cache key for the current source, pixel-affecting parameters
+        and resampling filter. Rasters are rendered about the image center and
+        the rotation point only shifts where they are placed, so a pan reuses
+        the same raster with or without a rotation point.
+        When the layer extends past the viewport (x0, y0, x1, y1 in canvas
+        coordinates), the key also holds the clip box to render; it is None
+        when the whole layer is rendered.
+        """
+        scale = quantize(self.scale, SCALE_QUANTUM)
+        angle = quantize(self.angle % 360, ANGLE_QUANTUM)
+        clip = None
+        if viewport is not None:
+            clip = self.clip_box(scale, angle, viewport)
+        return (
+            self.source_for_scale(scale),
+            scale,
+            angle,
+            self.is_flipped_horizontally,
+            self.is_flipped_vertically,
+            quantize(self.image_transparency_level, 0.001),
+            resample,
+            clip
+        )
+
+    def clip_box(self, scale, angle, viewport):
+        """
+        Returns the part of the layer to render, in raster coordinates, or None
+        if the layer fits in the viewport grown by CLIP_MARGIN.
+        """
+        width, height = self.size
+        transform = build_layer_transform(
+            width, height, scale, angle, self.is_flipped_horizontally, self.is_flipped_vertically
+        )
+        left, top, right, bottom = transform.bounds(*self.content_box)
+        origin_x, origin_y = self.raster_position(angle, 0, 0)
+        x0, y0, x1, y1 = viewport
+        x0 = math.floor((x0 - origin_x - CLIP_MARGIN) / CLIP_GRID) * CLIP_GRID
+        y0 = math.floor((y0 - origin_y - CLIP_MARGIN) / CLIP_GRID) * CLIP_GRID
+        x1 = math.ceil((x1 - origin_x + CLIP_MARGIN) / CLIP_GRID) * CLIP_GRID
+        y1 = math.ceil((y1 - origin_y + CLIP_MARGIN) / CLIP_GRID) * CLIP_GRID
+        if left >= x0 and top >= y0 and right <= x1 and bottom <= y1:
+            return None
+        # Off-screen layers get an empty box at their corner
+        clip_left, clip_top = min(max(left, x0), right), min(max(top, y0), bottom)
+        return (clip_left, clip_top, max(min(right, x1), clip_left), max(min(bottom, y1), clip_top))
+
+    def raster_position(self, angle, left, top):
+        """
+        Returns the canvas position of raster coordinates (left, top) for a
+        raster rendered at angle: the image offset, moved by the rotation
+        point shift.
+        """
+        shift_x, shift_y = 0.0, 0.0
+        if self.rotation_point:
+            pivot = (self.rotation_point[0] - self.offset_x, self.rotation_point[1] - self.offset_y)
+            shift_x, shift_y = pivot_shift(pivot, angle)
+        return self.offset_x + shift_x + left, self.offset_y + shift_y + top
+
+    def render(self, key):
+        """
+        Renders the raster for this image from a quantized render key.
+        Clipped renders of large photos are assembled from cached tiles.
+        Line art is resampled as an alpha mask and coloured here, last.
+        Returns the raster and the position of its top-left corner in raster
+        coordinates (see raster_position). Safe to call from render threads.
+        """
+        if key[-1] is not None and self.tiled:
+            img, left, top = self.render_tiled(key)
+        else:
+            img, left, top = self.resample(key)
+        return self.colorize(img), left, top
+
+    def colorize(self, img):
+        """
+        Turns a resampled alpha mask into an RGBA raster in the tint colour.
+        """
+        if self.tint is None:
+            return img
+        raster = Image.new("RGBA", img.size, self.tint)
+        raster.putalpha(img)
+        return raster
+
+    def resample(self, key):
+        """
+        Resamples the source for a render key. Scale, flips and rotation are composed into one affine transform and
+        applied with a single resample, sized to the rotated bounding box.
+        The resample starts from the source named in the key: a vector raster
+        or the nearest pyramid level above the scale.
+        With a clip box only that part of the output is produced, from the
+        part of the source that maps into it, so the cost follows the
+        viewport size rather than the zoom level.
+        Returns the resampled pixels, in the mode of the source, and the
+        position of their top-left corner in raster coordinates.
+        """
+        source, scale, angle, flip_h, flip_v, transparency, resample, clip = key
+        width, height = self.size
+        if clip is None:
+            img = self.transparency_variant(transparency, source)
+        else:
+            img = self.source_image(source)
+
+        content_left, content_top, content_right, content_bottom = self.content_box
+        transform = (
+            AffineTransform.scaling((content_right - content_left) / img.width, (content_bottom - content_top) / img.height)
+            .then(AffineTransform.translation(content_left, content_top))
+            .then(build_layer_transform(width, height, scale, angle, flip_h, flip_v))
+        )
+        left, top, right, bottom = clip or transform.bounds(0, 0, img.width, img.height)
+        size = (max(right - left, 1), max(bottom - top, 1))
+
+        # Map output pixels back to source pixels
+        inverse = AffineTransform.translation(left, top).then(transform.inverse())
+        if clip is not None:
+            # Crop the source to the region the clip box samples, with room for the filter
+            src_left, src_top, src_right, src_bottom = inverse.bounds(0, 0, size[0], size[1])
+            crop = (
+                max(src_left - 2, 0), max(src_top - 2, 0),
+                min(src_right + 2, img.width), min(src_bottom + 2, img.height)
+            )
+            if crop[2] <= crop[0] or crop[3] <= crop[1]:
+                # Nothing of the layer falls inside the clip box
+                return Image.new(img.mode, size), left, top
+            img = img.crop(crop)
+            if transparency < 1.0:
+                img = scale_alpha(img, transparency)
+            inverse = inverse.then(AffineTransform.translation(-crop[0], -crop[1]))
+        img = img.transform(size, Image.AFFINE, inverse.matrix, resample)
+        return img, left, top
+
+    def render_tiled(self, key):
+        """
+        Assembles a clipped raster from TILE_SIZE output tiles. Tiles are laid
+        out on a grid in raster coordinates and cached by the render
+        parameters, so panning only renders the tiles that scroll into view.
+        """
+        left, top, right, bottom = key[-1]
+        tile_params = key[:-1]
+        raster = Image.new(self.image_original.mode, (max(right - left, 1), max(bottom - top, 1)))
+        for tile_y in range(math.floor(top / TILE_SIZE), math.ceil(bottom / TILE_SIZE)):
+            for tile_x in range(math.floor(left / TILE_SIZE), math.ceil(right / TILE_SIZE)):
+                tile_key = (tile_params, tile_x, tile_y)
+                tile = self.tile_cache.get(tile_key)
+                if tile is None:
+                    x, y = tile_x * TILE_SIZE, tile_y * TILE_SIZE
+                    tile, _, _ = self.resample(tile_params + ((x, y, x + TILE_SIZE, y + TILE_SIZE),))
+                    self.tile_cache.put(tile_key, tile)
+                raster.paste(tile, (tile_x * TILE_SIZE - left, tile_y * TILE_SIZE - top))
+        return raster, left, top
+
+    def canvas_transform(self):
+        """
+        Returns the transform from source pixel coordinates to canvas
+        coordinates. Shared by rendering and any code that needs to map
+        between the canvas and the image (picking, export).
+        """
+        return build_layer_transform(
+            self.size[0], self.size[1], self.scale, self.angle,
+            self.is_flipped_horizontally, self.is_flipped_vertically
+        ).then(AffineTransform.translation(*self.raster_position(self.angle, 0, 0)))
+
+    def canvas_to_image(self, x, y):
+        """
+        Maps a canvas point to source pixel coordinates.
+        """
+        return self.canvas_transform().inverse().apply(x, y)
+
+    def hit_test(self, x, y):
+        """
+        Returns True if the canvas point lands on a non-transparent pixel of
+        the layer.
+        """
+        source_x, source_y = self.canvas_to_image(x, y)
+        left, top, right, bottom = self.content_box
+        if not (left <= source_x < right and top <= source_y < bottom):
+            return False
+        image = self.image_original
+        pixel = image.getpixel((
+            min(int((source_x - left) * image.width / (right - left)), image.width - 1),
+            min(int((source_y - top) * image.height / (bottom - top)), image.height - 1)
+        ))
+        if image.mode == "L":
+            return pixel > 0  # Alpha mask of tinted line art
+        bands = image.getbands()
+        return 'A' not in bands or pixel[bands.index('A')] > 0
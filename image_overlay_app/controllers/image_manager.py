@@ -2,6 +2,7 @@
 
 import logging
 import math
+from PIL import Image
 from models.image_state import ImageState
 from utils.image_utils import open_image_file
 from tkinter import messagebox, filedialog
@@ -55,7 +56,7 @@ class ImageManager:
                     )
 
                 # Redraw images
-                self.app.image_window.draw_images()
+                self.app.image_window.request_render()
             else:
                 # Show the image
                 image_state.visible = True
@@ -73,7 +74,7 @@ class ImageManager:
                 self.update_button_text(image_name, hide=True)
 
                 # Redraw images
-                self.app.image_window.draw_images()
+                self.app.image_window.request_render()
 
                 # Ensure image window is visible
                 if not self.app.image_window.is_visible:
@@ -105,14 +106,16 @@ class ImageManager:
         filepath = os.path.join(image_dir, filename)
 
         if os.path.exists(filepath):
-            image_original = open_image_file(filepath)
+            canvas_width, canvas_height = self.get_canvas_size()
+
+            max_width = canvas_width * 0.8  # 80% of canvas width
+            max_height = canvas_height * 0.8  # 80% of canvas height
+
+            # Decode at reduced resolution when the file is much larger than needed
+            image_original = open_image_file(filepath, (max(int(max_width), 1), max(int(max_height), 1)))
             if image_original:
                 # Optionally resize for performance
                 scaling_factor = 1.0
-                canvas_width, canvas_height = self.get_canvas_size()
-
-                max_width = canvas_width * 0.8  # 80% of canvas width
-                max_height = canvas_height * 0.8  # 80% of canvas height
 
                 if image_original.width > max_width or image_original.height > max_height:
                     scaling_factor = min(
@@ -151,7 +154,7 @@ class ImageManager:
                 self.update_button_text(image_name, hide=True)
 
                 # Draw images
-                self.app.image_window.draw_images()
+                self.app.image_window.request_render()
 
                 # Ensure image window is visible
                 if not self.app.image_window.is_visible:
@@ -205,7 +208,7 @@ class ImageManager:
             if image_state.visible:
                 image_state.offset_x = new_width / 2
                 image_state.offset_y = new_height / 2
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
         logging.info(
             f"Image window resized to ({new_width}x{new_height}). Visible images re-centered."
         )
@@ -230,7 +233,7 @@ class ImageManager:
         if image_name in self.images and self.images[image_name].visible:
             self.active_image_name = image_name
             self.app.buttons_window.set_active_image(image_name)
-            self.app.image_window.draw_images()
+            self.app.image_window.request_render()
             logging.info(f"Active image changed to '{image_name}'.")
         else:
             logging.warning(
@@ -250,7 +253,7 @@ class ImageManager:
             else:
                 # If already loaded, make it visible
                 self.images["Ruler"].visible = True
-                self.app.image_window.draw_images()
+                self.app.image_window.request_render()
             self.app.image_window.ruler_visible = True
             self.app.buttons_window.btn_open_ruler.config(text="Hide Ruler")
             # Update the visibility checkbox
@@ -259,7 +262,7 @@ class ImageManager:
             # Hide the ruler
             if "Ruler" in self.images:
                 self.images["Ruler"].visible = False
-                self.app.image_window.draw_images()
+                self.app.image_window.request_render()
             self.app.image_window.ruler_visible = False
             self.app.buttons_window.btn_open_ruler.config(text="Open Ruler")
             # Update the visibility checkbox
@@ -279,7 +282,7 @@ class ImageManager:
         else:
             active_image.image_transparency_level = 1.0
             self.app.buttons_window.btn_toggle_transparency.config(text="Min Transp")
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def flip_image_horizontal(self):
         """
@@ -289,7 +292,7 @@ class ImageManager:
         if not active_image:
             return
         active_image.is_flipped_horizontally = not active_image.is_flipped_horizontally
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def flip_image_vertical(self):
         """
@@ -299,7 +302,7 @@ class ImageManager:
         if not active_image:
             return
         active_image.is_flipped_vertically = not active_image.is_flipped_vertically
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def toggle_rotation_point_mode(self):
         """
@@ -316,7 +319,7 @@ class ImageManager:
             self.app.image_window.is_rotation_point_mode = False
             self.app.buttons_window.btn_set_rotation_point.config(text="Set Rot Pt")
             active_image.rotation_point = None
-            self.app.image_window.draw_images()
+            self.app.image_window.request_render()
             logging.info("Rotation point mode disabled and rotation point reset.")
 
     def zoom_in(self):
@@ -336,7 +339,7 @@ class ImageManager:
         active_image.scale_log = math.log2(active_image.scale)
 
         # Redraw images
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def zoom_out(self):
         """
@@ -355,7 +358,7 @@ class ImageManager:
         active_image.scale_log = math.log2(active_image.scale)
 
         # Redraw images
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def fine_zoom_in(self):
         """
@@ -374,7 +377,7 @@ class ImageManager:
         active_image.scale_log = math.log2(active_image.scale)
 
         # Redraw images
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def fine_zoom_out(self):
         """
@@ -393,7 +396,7 @@ class ImageManager:
         active_image.scale_log = math.log2(active_image.scale)
 
         # Redraw images
-        self.app.image_window.draw_images()
+        self.app.image_window.request_render()
 
     def on_mouse_move(self, event):
         """
@@ -1,12 +1,20 @@
 # main.py
 
+import os
+import sys
 import tkinter as tk
+
+# The Tk-free rendering core lives in the OrthyApp package at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
 from controllers.image_manager import ImageManager
 from views.buttons_window import ButtonsWindow
 from views.image_window import ImageWindow
 import logging
 from logging.handlers import RotatingFileHandler
-import sys
+from OrthyApp.gui.helpers import start_queue_logging
 
 class ImageOverlayApp:
     """
@@ -33,7 +41,9 @@ class ImageOverlayApp:
 
     def setup_logging(self):
         """
-        Sets up the logging configuration.
+        Sets up the logging configuration. The file and console handlers run
+        on a background thread, so a slow or scanned log file never blocks
+        the UI.
         """
         logger = logging.getLogger()
         logger.setLevel(logging.INFO)  # Change to DEBUG for more detailed logs
@@ -43,18 +53,23 @@ class ImageOverlayApp:
         # File handler with rotation
         file_handler = RotatingFileHandler("app.log", maxBytes=5*1024*1024, backupCount=2)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
 
         # Stream handler for console output
         stream_handler = logging.StreamHandler()
         stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
+
+        self.log_listener = start_queue_logging(logger, file_handler, stream_handler)
 
     def on_close(self):
         """
         Handles the closing of the application.
         """
         logging.info("Application is closing.")
+        self.image_window.render_scheduler.stop()
+        logging.info(f"Render scheduler stats: {self.image_window.render_scheduler.stats()}")
+        logging.info(f"PhotoImage stats: {self.image_window.photo_stats}")
+        logging.info(f"Flattened layer stats: {self.image_window.flatten_stats}")
+        self.log_listener.stop()  # Writes the remaining records
         self.root.destroy()
         sys.exit(0)
 
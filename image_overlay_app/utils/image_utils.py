@@ -2,32 +2,41 @@
 
 import os
 from PIL import Image
-import cairosvg
 import logging
 from tkinter import messagebox
-from io import BytesIO
+from OrthyApp.image_processing.loaders import SvgConversionError, rasterize_svg
 
-def open_image_file(filepath):
+def open_image_file(filepath, max_size=None):
     """
     Opens an image file and returns a PIL Image object.
-    Supports SVG by converting it to PNG in memory.
+    Supports SVG by rasterizing it with cairosvg, or loading the raster
+    from the on-disk SVG cache.
+    With max_size (width, height), raster images are decoded at a reduced
+    resolution that still covers it: JPEGs through draft(), other formats
+    by an integer reduce(). The caller resizes the rest of the way.
     """
     try:
         file_ext = os.path.splitext(filepath)[1].lower()
         if file_ext == '.svg':
-            # Convert SVG to PNG using cairosvg and load into PIL from memory
-            png_data = cairosvg.svg2png(url=filepath)
-            image = Image.open(BytesIO(png_data)).convert("RGBA")
-            image.load()  # Ensure the image is fully loaded
-            logging.info(f"Converted SVG to PNG: {filepath}")
+            # Rasterize the SVG, or load it from the disk cache
+            image = rasterize_svg(filepath)
+            logging.info(f"Rasterized SVG: {filepath}")
             return image
         else:
             # Open other image formats directly
-            image = Image.open(filepath).convert("RGBA")
+            image = Image.open(filepath)
+            if max_size:
+                image.draft("RGB", max_size)
+                factor = int(min(image.width / max_size[0], image.height / max_size[1]))
+                if factor >= 2:
+                    if image.mode not in ("L", "LA", "RGB", "RGBA"):
+                        image = image.convert("RGBA")
+                    image = image.reduce(factor)
+            image = image.convert("RGBA")
             image.load()  # Ensure the image is fully loaded
             logging.info(f"Opened image file: {filepath}")
             return image
-    except cairosvg.CairoSVGError as e:
+    except SvgConversionError as e:
         logging.error(f"CairoSVG error while converting '{filepath}': {e}")
         messagebox.showerror(
             "SVG Conversion Error",
@@ -3,6 +3,7 @@
 import tkinter as tk
 from tkinter import ttk
 import logging
+from OrthyApp.image_processing.renderer import NUMPY_AVAILABLE
 
 class ButtonsWindow(tk.Toplevel):
     """
@@ -43,6 +44,7 @@ class ButtonsWindow(tk.Toplevel):
         self.create_ruler_button()
         self.create_load_default_image_buttons()  # New method for default images
         self.create_hide_show_image_window_button()  # New method to create Hide/Show button
+        self.create_composite_mode_control()
 
         # Configure grid weights for equal button sizes
         for i in range(2):
@@ -244,6 +246,19 @@ class ButtonsWindow(tk.Toplevel):
         self.btn_hide_show_image.grid(row=14, column=0, columnspan=2, pady=5, sticky='ew')
         logging.info("Created 'Hide Window' button.")
 
+    def create_composite_mode_control(self):
+        """
+        Creates a checkbox to draw all images as one composited frame.
+        Disabled when NumPy is not installed.
+        """
+        self.composite_mode_var = tk.BooleanVar(value=False)
+        self.chk_composite_mode = tk.Checkbutton(
+            self.btn_frame, text="Single Frame", variable=self.composite_mode_var,
+            command=lambda: self.app.image_window.set_composite_mode(self.composite_mode_var.get()),
+            state='normal' if NUMPY_AVAILABLE else 'disabled'
+        )
+        self.chk_composite_mode.grid(row=15, column=0, columnspan=2, pady=5, sticky='ew')
+
     def set_active_image(self, image_name: str):
         """
         Sets the active image in the dropdown menu.
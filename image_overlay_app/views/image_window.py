@@ -1,9 +1,10 @@
 # views/image_window.py
 
 import tkinter as tk
-from PIL import ImageTk, Image
 import logging
 import sys
+from OrthyApp.gui.helpers import PhotoBuffer, RenderScheduler
+from OrthyApp.image_processing.renderer import NUMPY_AVAILABLE, FrameCompositor, flatten_layers, render_layers
 
 class ImageWindow:
     """
@@ -42,6 +43,30 @@ class ImageWindow:
         self.canvas = tk.Canvas(self.image_window, bg='grey', highlightthickness=0, borderwidth=0)
         self.canvas.pack(fill='both', expand=True)
 
+        # Coalesce redraw requests into at most one render per frame
+        self.render_scheduler = RenderScheduler(self.canvas, self.draw_images)
+
+        # Optionally blend all images into one frame instead of one canvas item each
+        self.composite_mode = False
+        self.compositor = FrameCompositor()
+        self.frame_photo = None  # PhotoBuffer of the composited frame
+
+        # Tk photos are kept per image and updated in place; see PhotoBuffer
+        self.photo_buffers = {}
+        self.photo_stats = {'allocations': 0, 'pastes': 0, 'blanks': 0}
+
+        # Canvas items persist between frames and are moved or pointed at a new
+        # photo instead of being recreated
+        self.canvas_items = {}  # ('image', name), ('group', group) or ('frame',) -> item
+        self.item_order = []  # Stacking order of the items, bottom first
+        self.marker_items = {}  # Image name -> rotation point marker item
+
+        # The images below and above the active one are flattened into one
+        # bitmap each and reused until one of them changes
+        self.flattened_groups = {}  # group -> (signature, sources, flattened layer)
+        self.group_buffers = {}  # group -> PhotoBuffer
+        self.flatten_stats = {'builds': 0, 'reuses': 0}
+
         # Bind mouse events
         self.bind_events()
 
@@ -68,81 +93,219 @@ class ImageWindow:
             self.canvas.bind("<Button-4>", lambda event: self.app.image_manager.on_mouse_wheel(event))
             self.canvas.bind("<Button-5>", lambda event: self.app.image_manager.on_mouse_wheel(event))
 
+    def request_render(self):
+        """
+        Requests a redraw. Requests are coalesced into one render per frame.
+        """
+        self.render_scheduler.request()
+
+    def set_composite_mode(self, enabled):
+        """
+        Switches between one canvas item per image and a single composited
+        frame. The composited mode needs NumPy.
+        """
+        if enabled and not NUMPY_AVAILABLE:
+            logging.warning("Composited frame mode requires NumPy.")
+            return
+        self.composite_mode = enabled
+        # The group photos were not kept up to date in the other mode
+        self.frame_photo = None
+        self.flattened_groups.clear()
+        self.group_buffers.clear()
+        self.request_render()
+        logging.info("Composited frame mode %s.", 'enabled' if enabled else 'disabled')
+
     def draw_images(self):
         """
-        Draws all visible images on the canvas.
+        Draws all visible images on the canvas. The canvas items of the last
+        frame are updated in place; items that are no longer shown are deleted.
         """
-        self.canvas.delete("all")  # Clear the canvas
-        for image_state in self.app.image_manager.images.values():
-            if image_state.visible:
-                self.draw_image(image_state)
+        images = self.app.image_manager.images
+        visible_images = [image_state for image_state in images.values() if image_state.visible]
+
+        # Release the photos of images that were removed
+        for name in list(self.photo_buffers):
+            if name not in images:
+                del self.photo_buffers[name]
+
+        below, active_image, above = self.split_layers(visible_images)
+        if self.composite_mode:
+            order = [self.draw_composite_frame(below, active_image, above)]
+        else:
+            order = [self.draw_flattened('below', below)]
+            if active_image is not None:
+                order.append(self.draw_image(active_image))
+            order.append(self.draw_flattened('above', above))
+        self.restack([key for key in order if key is not None])
 
         # Draw rotation points if any
-        for image_state in self.app.image_manager.images.values():
-            if image_state.rotation_point and image_state.visible:
-                self.show_rotation_point(*image_state.rotation_point)
+        markers = set()
+        for image_state in visible_images:
+            if image_state.rotation_point:
+                self.show_rotation_point(image_state.name, *image_state.rotation_point)
+                markers.add(image_state.name)
+        for name in list(self.marker_items):
+            if name not in markers:
+                self.canvas.delete(self.marker_items.pop(name))
 
         self.image_window.update_idletasks()
 
-    def draw_image(self, image_state):
+    def place_item(self, key, buffer, reallocated, x, y):
         """
-        Applies transformations to an image and draws it on the canvas.
+        Shows a photo at (x, y) through the persistent canvas item for key,
+        creating the item on first use. Returns the key.
         """
-        # Apply transformations
-        img = image_state.image_original.copy()
-
-        # Apply transparency
-        if image_state.image_transparency_level < 1.0:
-            alpha = img.getchannel('A')
-            alpha = alpha.point(lambda p: int(p * image_state.image_transparency_level))
-            img.putalpha(alpha)
-
-        # Apply flipping
-        if image_state.is_flipped_horizontally:
-            img = img.transpose(Image.FLIP_LEFT_RIGHT)
-        if image_state.is_flipped_vertically:
-            img = img.transpose(Image.FLIP_TOP_BOTTOM)
+        item = self.canvas_items.get(key)
+        if item is None:
+            self.canvas_items[key] = self.canvas.create_image(x, y, image=buffer.photo, anchor='nw')
+        else:
+            if reallocated:
+                self.canvas.itemconfigure(item, image=buffer.photo)
+            self.canvas.coords(item, x, y)
+        return key
 
-        # Apply scaling
-        img = img.resize(
-            (int(img.width * image_state.scale), int(img.height * image_state.scale)),
-            Image.LANCZOS
-        )
+    def restack(self, order):
+        """
+        Deletes the canvas items not in order and stacks the rest bottom
+        first, below the rotation point markers.
+        """
+        for key in list(self.canvas_items):
+            if key not in order:
+                self.canvas.delete(self.canvas_items.pop(key))
+        if order != self.item_order:
+            for key in order:
+                self.canvas.tag_raise(self.canvas_items[key])
+            self.canvas.tag_raise("rotation_point")
+            self.item_order = order
 
-        # Apply rotation around the rotation point if set
-        if image_state.rotation_point:
-            rotation_center = (
-                image_state.rotation_point[0] - (image_state.offset_x - img.width / 2),
-                image_state.rotation_point[1] - (image_state.offset_y - img.height / 2)
-            )
-            img = img.rotate(image_state.angle, expand=True, center=rotation_center)
-        else:
-            img = img.rotate(image_state.angle, expand=True)
+    def draw_image(self, image_state):
+        """
+        Renders an image and draws it on the canvas. Returns the key of its
+        canvas item, or None if the image could not be rendered.
+        """
+        placed = render_layers([image_state], self.viewport())
+        if not placed:
+            return None
+        img, x, y = placed[0]
+
+        # Update the image's persistent PhotoImage in place
+        buffer = self.photo_buffers.get(image_state.name)
+        if buffer is None:
+            buffer = self.photo_buffers[image_state.name] = PhotoBuffer(self.photo_stats)
+        reallocated = buffer.update(img)
+        image_state.photo_image = buffer.photo  # Keep a reference to prevent garbage collection
+
+        # The photo may be larger than the image, so it is anchored at the
+        # image's top-left corner
+        return self.place_item(('image', image_state.name), buffer, reallocated, x, y)
+
+    def viewport(self):
+        """
+        Returns the visible canvas area as (left, top, right, bottom).
+        """
+        return (0, 0, self.canvas.winfo_width(), self.canvas.winfo_height())
 
-        # Convert to ImageTk.PhotoImage
-        photo = ImageTk.PhotoImage(img)
-        image_state.photo_image = photo  # Keep a reference to prevent garbage collection
+    def split_layers(self, visible_images):
+        """
+        Splits the visible images into those below the active image, the
+        active image and those above it. Without a visible active image every
+        image is in the lower group.
+        """
+        active_name = self.app.image_manager.active_image_name
+        for index, image_state in enumerate(visible_images):
+            if image_state.name == active_name:
+                return visible_images[:index], image_state, visible_images[index + 1:]
+        return visible_images, None, []
 
-        # Draw the image on the canvas
-        self.canvas.create_image(
-            image_state.offset_x, image_state.offset_y, image=photo
+    def flattened_layer(self, group, images):
+        """
+        Returns the images blended into one (image, x, y) layer, or None, and
+        whether it was rebuilt. The layer is reused until an image in the
+        group is transformed, replaced or the canvas is resized.
+        """
+        if not images:
+            self.flattened_groups.pop(group, None)
+            return None, False
+        viewport = self.viewport()
+        # The render keys cover the pixels; the raster position covers the placement
+        keys = [image_state.render_key(viewport=viewport) for image_state in images]
+        signature = (viewport,) + tuple(
+            (id(image_state), id(image_state.image_original), key, image_state.raster_position(key[2], 0, 0))
+            for image_state, key in zip(images, keys)
         )
-
-    def show_rotation_point(self, x, y):
+        cached = self.flattened_groups.get(group)
+        if cached is not None and cached[0] == signature:
+            self.flatten_stats['reuses'] += 1
+            return cached[2], False
+        layer = flatten_layers(render_layers(images, viewport), viewport)
+        # The sources are held so the ids in the signature stay unique
+        sources = [(image_state, image_state.image_original) for image_state in images]
+        self.flattened_groups[group] = (signature, sources, layer)
+        self.flatten_stats['builds'] += 1
+        return layer, True
+
+    def draw_flattened(self, group, images):
+        """
+        Draws a group of images as one flattened canvas item. Returns the key
+        of the item, or None if the group shows nothing.
+        """
+        layer, rebuilt = self.flattened_layer(group, images)
+        if layer is None:
+            self.group_buffers.pop(group, None)
+            return None
+        img, left, top = layer
+        buffer = self.group_buffers.get(group)
+        if buffer is None:
+            buffer = self.group_buffers[group] = PhotoBuffer(self.photo_stats)
+            rebuilt = True
+        reallocated = buffer.update(img) if rebuilt else False
+        return self.place_item(('group', group), buffer, reallocated, left, top)
+
+    def draw_composite_frame(self, below, active_image, above):
         """
-        Displays the rotation point on the canvas.
+        Blends the transformed images into one frame and draws it as a single
+        canvas item, so Tk composites one image instead of one per layer.
+        Returns the key of the item, or None if the frame is empty.
+        """
+        layers = []
+        layer, _ = self.flattened_layer('below', below)
+        if layer is not None:
+            layers.append(layer)
+        if active_image is not None:
+            layers.extend(render_layers([active_image], self.viewport()))
+        layer, _ = self.flattened_layer('above', above)
+        if layer is not None:
+            layers.append(layer)
+        frame = self.compositor.compose(layers, self.viewport())
+        if frame is None:
+            self.frame_photo = None
+            return None
+        img, left, top = frame
+        if self.frame_photo is None:
+            self.frame_photo = PhotoBuffer(self.photo_stats)
+        reallocated = self.frame_photo.update(img)
+        return self.place_item(('frame',), self.frame_photo, reallocated, left, top)
+
+    def show_rotation_point(self, name, x, y):
+        """
+        Displays the rotation point of an image on the canvas.
         """
         radius = 5  # Size of the rotation point marker
-        self.canvas.create_oval(
-            x - radius, y - radius, x + radius, y + radius,
-            fill="red", outline="black", tags="rotation_point"
-        )
+        coords = (x - radius, y - radius, x + radius, y + radius)
+        item = self.marker_items.get(name)
+        if item is None:
+            self.marker_items[name] = self.canvas.create_oval(
+                *coords, fill="red", outline="black", tags="rotation_point"
+            )
+        else:
+            self.canvas.coords(item, *coords)
 
     def hide_rotation_point(self):
         """
         Hides the rotation point from the canvas.
         """
         self.canvas.delete("rotation_point")
+        self.marker_items.clear()
 
     def make_fullscreen(self):
         """
@@ -167,6 +330,7 @@ class ImageWindow:
         """
         Closes the image window gracefully.
         """
+        self.render_scheduler.stop()
         self.image_window.destroy()
         logging.info("Image window closed.")
 
@@ -0,0 +1,103 @@
+"""
+Benchmark for the per-item and composited frame modes.
+
+Renders the bundled SVG templates once, then times frames in a Tk window with
+every layer either shown as its own canvas item (moved each frame, so Tk
+composites all transparent layers) or blended into one NumPy frame shown as a
+single item. Needs a display and NumPy. Run from this directory:
+
+    python bench_composite.py [--frames 30] [--scale 2.0] [--size 3840x2160]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+
+from PIL import ImageTk
+
+# The rendering core lives in the OrthyApp package at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from OrthyApp.image_processing.renderer import FrameCompositor, render_layers
+
+from bench_render import load_templates
+
+
+def layer_positions(rasters, width, height, frame):
+    """
+    Centers every raster in the window, drifting one pixel per frame so each
+    frame has to be redrawn.
+    """
+    return [
+        (raster, (width - raster.width) // 2 + frame, (height - raster.height) // 2)
+        for raster in rasters
+    ]
+
+
+def run_per_item(root, canvas, rasters, frames, width, height):
+    photos = [ImageTk.PhotoImage(raster) for raster in rasters]
+    items = [canvas.create_image(0, 0, image=photo, anchor='nw') for photo in photos]
+    root.update()
+    start = time.perf_counter()
+    for frame in range(frames):
+        for item, (_, x, y) in zip(items, layer_positions(rasters, width, height, frame)):
+            canvas.coords(item, x, y)
+        root.update()
+    elapsed = (time.perf_counter() - start) / frames
+    canvas.delete("all")
+    return elapsed
+
+
+def run_composited(root, canvas, rasters, frames, width, height):
+    compositor = FrameCompositor()
+    item = canvas.create_image(0, 0, anchor='nw')
+    root.update()
+    start = time.perf_counter()
+    for frame in range(frames):
+        result = compositor.compose(layer_positions(rasters, width, height, frame), (0, 0, width, height))
+        if result is not None:
+            img, left, top = result
+            photo = ImageTk.PhotoImage(img)
+            canvas.itemconfigure(item, image=photo)
+            canvas.coords(item, left, top)
+        root.update()
+    elapsed = (time.perf_counter() - start) / frames
+    canvas.delete("all")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=30, help="frames timed per mode")
+    parser.add_argument("--scale", type=float, default=2.0, help="zoom level of every layer")
+    parser.add_argument("--size", default=None, help="window size as WIDTHxHEIGHT (default: screen size)")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    if args.size:
+        width, height = (int(v) for v in args.size.lower().split("x"))
+    else:
+        width, height = root.winfo_screenwidth(), root.winfo_screenheight()
+    root.geometry(f"{width}x{height}+0+0")
+    canvas = tk.Canvas(root, bg='grey', highlightthickness=0, borderwidth=0)
+    canvas.pack(fill='both', expand=True)
+
+    images_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images")
+    states = load_templates(images_dir)
+    for state in states:
+        state.scale = args.scale
+    rasters = [raster for raster, _, _ in render_layers(states)]
+    print(f"{len(rasters)} layers, scale {args.scale}, window {width}x{height}, {args.frames} frames per mode")
+
+    per_item = run_per_item(root, canvas, rasters, args.frames, width, height)
+    print(f"per-item:   {per_item * 1000:8.1f} ms/frame")
+    composited = run_composited(root, canvas, rasters, args.frames, width, height)
+    print(f"composited: {composited * 1000:8.1f} ms/frame  speed-up x{per_item / composited:.2f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark for parallel per-layer rasterization.
+
+Rasterizes the bundled SVG templates, then renders every layer of a frame on a
+thread pool of 1..N threads and reports the frame time and speed-up for each
+pool size. Frames go through render_layers with viewport-clipped render keys,
+as the apps' frames do. Uses only the Tk-free rendering core, so it
+runs on a headless machine. Run from this directory:
+
+    python bench_render.py [--frames 20] [--scale 2.0] [--max-threads 8] [--size 1920x1080]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The rendering core lives in the OrthyApp package at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from OrthyApp.image_processing.loaders import rasterize_svg
+from OrthyApp.image_processing.renderer import render_layers
+from OrthyApp.image_processing.transformations import LayerState, SETTLED_RESAMPLE
+
+# Templates in the order the app stacks them
+TEMPLATES = [
+    ("Ruler", "liniar_new_n2.svg"),
+    ("Normal", "Normal(medium).svg"),
+    ("Tapered", "Tapered.svg"),
+    ("Ovoide", "Ovoide.svg"),
+    ("Narrow Tapered", "NarrowTapered.svg"),
+    ("Narrow Ovoide", "NarrowOvoide.svg"),
+    ("Angulation", "angulation.svg"),
+]
+
+
+def load_templates(images_dir):
+    """
+    Rasterizes the bundled templates into LayerState objects.
+    """
+    return [LayerState(rasterize_svg(os.path.join(images_dir, filename)), name) for name, filename in TEMPLATES]
+
+
+def run_frame(executor, states, frame, scale, viewport):
+    """
+    Renders all layers of one frame, centered in the viewport. The angle
+    changes every frame so that no raster is served from a cache.
+    """
+    for state in states:
+        state.scale = scale
+        state.angle = (frame * 1.5) % 360
+        state.image_transparency_level = 1.0
+        state.offset_x, state.offset_y = viewport[2] // 2, viewport[3] // 2
+    render_layers(states, viewport, SETTLED_RESAMPLE, executor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20, help="frames rendered per pool size")
+    parser.add_argument("--scale", type=float, default=2.0, help="zoom level of every layer")
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1, help="largest pool size")
+    parser.add_argument("--size", default="1920x1080", help="viewport size as WIDTHxHEIGHT")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    viewport = (0, 0, width, height)
+
+    images_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images")
+    states = load_templates(images_dir)
+    print(f"{len(states)} layers, scale {args.scale}, viewport {width}x{height}, {args.frames} frames per run")
+
+    # Warm up the pyramid levels so every run does the same work
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run_frame(executor, states, 0, args.scale, viewport)
+
+    baseline = None
+    threads = 1
+    while threads <= args.max_threads:
+        # Every run renders the same frames, so start each from empty render caches
+        for state in states:
+            state.render_cache.clear()
+            if state.tile_cache is not None:
+                state.tile_cache.clear()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            for frame in range(args.frames):
+                run_frame(executor, states, frame, args.scale, viewport)
+            elapsed = (time.perf_counter() - start) / args.frames
+        baseline = baseline or elapsed
+        print(f"{threads:2d} threads: {elapsed * 1000:8.1f} ms/frame  speed-up x{baseline / elapsed:.2f}")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,488 @@
 import sys
 import math
-import io
 import os
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import filedialog, colorchooser, simpledialog, messagebox
-from PIL import Image, ImageTk, ImageFont, ImageDraw
-import cairosvg  # For SVG support
+from PIL import Image, ImageFont, ImageDraw
 from pynput import keyboard  # For global keyboard events
 import logging   # For logging
+import atexit
+
+# The Tk-free rendering core lives in the OrthyApp package at the repository
+# root; frozen builds pick it up through pathex in orthy.spec
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from OrthyApp.image_processing.loaders import TemplatePreloader, default_cache_dir, open_reduced, rasterize_svg
+from OrthyApp.image_processing.transformations import INTERACTIVE_RESAMPLE, SETTLED_RESAMPLE, LayerState
+from OrthyApp.image_processing.renderer import NUMPY_AVAILABLE, FrameCompositor, render_jobs
+from OrthyApp.gui.helpers import PhotoBuffer, RenderScheduler, start_queue_logging
+
+
+def setup_logging():
+    """
+    Configures the logger. Records go through a queue to a background writer
+    thread, so a slow console or disk never blocks a frame. The writer is
+    flushed and stopped at exit.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)
+    listener = start_queue_logging(logger, handler)
+    atexit.register(listener.stop)
+    return listener
+
 
 # Configure the logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+log_listener = setup_logging()
+
+# Bytes of downsampled pyramid levels kept across all images
+PYRAMID_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Rendering quality: INTERACTIVE_RESAMPLE while input is active, a
+# SETTLED_RESAMPLE re-render once input has been idle for SETTLE_DELAY_MS
+SETTLE_DELAY_MS = 150
+
+# Control-mode keys move the active image while held. A press nudges it by one
+# step; once held for MOTION_HOLD_DELAY it moves continuously, accelerating
+# from the start speed to the top speed. Motion is updated once per tick.
+MOTION_TICK_MS = 16
+MOTION_HOLD_DELAY = 0.25  # Seconds
+# A held key without a press or OS repeat for this long is treated as
+# released; it must exceed the longest OS repeat delay
+MOTION_KEY_TIMEOUT = 1.1  # Seconds
+MOTION_PROFILES = {
+    # axis: (step, start speed, top speed, acceleration); speeds are per second
+    'move': (3, 40, 900, 1500),  # Pixels
+    'rotate': (0.5, 3, 90, 150),  # Degrees
+    'zoom': (0.01, 0.1, 1.5, 2.0),  # Step in scale units, speeds in log2 of the scale
+}
+MOTION_KEYS = {
+    # key: (axis, direction)
+    'w': ('y', -1), 's': ('y', 1), 'a': ('x', -1), 'd': ('x', 1),
+    'z': ('rotate', 1), 'c': ('rotate', -1),
+    'q': ('zoom', -1), 'e': ('zoom', 1),
+}
+
+# Commands posted by the keyboard listener threads wait in a bounded queue
+# until the Tk thread runs them; commands beyond the bound are dropped
+COMMAND_QUEUE_SIZE = 256
+
+# Repeated interaction messages (drags, nudges, zoom and rotate steps) are
+# summed into one log line per burst, written once input has been idle this long
+BURST_LOG_IDLE_MS = 1000
+
+# Number of threads used to rasterize the layers of a frame in parallel
+RENDER_THREADS = min(os.cpu_count() or 1, 8)
+
+# Blend all layers into one frame instead of one canvas item per layer
+# (needs NumPy; toggled at runtime with Ctrl+Alt+3)
+COMPOSITE_FRAME = False
+
+# Bundled templates decoded in the background at startup
+TEMPLATE_FILES = (
+    'liniar_new_n2.svg',
+    'Normal(medium).svg',
+    'Tapered.svg',
+    'Ovoide.svg',
+    'NarrowTapered.svg',
+    'NarrowOvoide.svg',
+    'angulation.svg',
 )
 
-class ImageState:
+
+class InputAccumulator:
     """
-    Represents the state of an individual image, including its transformations
-    and visibility settings.
+    Sums the drag, rotation and zoom deltas of pointer events between frames,
+    so a burst of events from a high-rate mouse or a trackpad flick changes
+    the image once per rendered frame. Translations are applied in whole
+    pixels; the fractions are carried to the next frame so motion does not
+    drift.
     """
 
-    def __init__(self, image_original, name):
-        self.image_original = image_original
-        self.image_display = None
-        self.name = name
-        self.visible = True
+    def __init__(self):
+        self.target = None  # Name of the image the pending deltas belong to
+        self.dx = 0.0
+        self.dy = 0.0
+        self.angle = 0.0  # Degrees
+        self.scale_log = 0.0  # log2 of the zoom factor
+        self.event_time = None  # perf_counter() time of the oldest pending key event
+        self.events = 0  # Events since the last frame
+
+        # Statistics
+        self.total_events = 0  # Events accumulated
+        self.frames = 0  # Frames that applied accumulated input
+        self.max_events = 0  # Most events applied in one frame
+
+    def add(self, target, dx=0.0, dy=0.0, angle=0.0, scale_log=0.0, event_time=None):
+        """
+        Adds the deltas of one event. event_time is the time of the key event
+        behind them, if any. Returns False if deltas for another image are
+        still pending; they must be applied first.
+        """
+        if self.events and target != self.target:
+            return False
+        self.target = target
+        self.dx += dx
+        self.dy += dy
+        self.angle += angle
+        self.scale_log += scale_log
+        if event_time is not None and (self.event_time is None or event_time < self.event_time):
+            self.event_time = event_time
+        self.events += 1
+        self.total_events += 1
+        return True
+
+    def take(self):
+        """
+        Returns the target, the (dx, dy, angle, scale_log) deltas summed since
+        the last frame and the oldest key event time, or None if no event
+        arrived. dx and dy are whole pixels; the remainders stay pending.
+        """
+        if not self.events:
+            return None
+        dx, dy = round(self.dx), round(self.dy)
+        self.dx -= dx
+        self.dy -= dy
+        deltas = (dx, dy, self.angle, self.scale_log)
+        self.angle = 0.0
+        self.scale_log = 0.0
+        self.frames += 1
+        self.max_events = max(self.max_events, self.events)
+        self.events = 0
+        event_time, self.event_time = self.event_time, None
+        return self.target, deltas, event_time
+
+    def stats(self):
+        """
+        Returns the event and frame counters and the events handled per frame.
+        """
+        return {
+            'events': self.total_events,
+            'frames': self.frames,
+            'events_per_frame': round(self.total_events / self.frames, 2) if self.frames else 0.0,
+            'max_events_per_frame': self.max_events,
+        }
+
+
+class KeyStateTracker:
+    """
+    Tracks which keys are held, fed by the press and release events of the
+    global keyboard listener thread. OS key repeats arrive as further presses
+    of a held key; they are counted and otherwise ignored, so callers only
+    act on the press transition. Keys are named by their lower-cased char and
+    also remembered by virtual key code, so a release still matches when a
+    modifier changed the char between press and release.
+    """
 
-        # Transformation properties
-        self.angle = 0
-        self.scale = 1.0
-        self.scale_log = 0
-        self.offset_x = 512
-        self.offset_y = 512
-        self.rotation_point = None
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.held = {}  # Key -> [press time, last press or repeat time, vk]
+        self.presses = 0  # Press transitions
+        self.repeats = 0  # OS key repeats ignored
+        self.expired = 0  # Held keys dropped without a release
 
-        # Flip properties
-        self.is_flipped_horizontally = False
-        self.is_flipped_vertically = False
+    def press(self, key, vk=None):
+        """
+        Records a press. Returns True if the key was not already held.
+        """
+        now = time.perf_counter()
+        with self.lock:
+            if key in self.held:
+                self.held[key][1] = now
+                self.repeats += 1
+                return False
+            self.held[key] = [now, now, vk]
+            self.presses += 1
+            return True
 
-        # Transparency
-        self.image_transparency_level = 0.2  # Set to minimum transparency by default
+    def release(self, key, vk=None):
+        """
+        Records a release of the key and of any held key with the same vk.
+        """
+        with self.lock:
+            self.held.pop(key, None)
+            if vk is not None:
+                for other in [k for k, (_, _, held_vk) in self.held.items() if held_vk == vk]:
+                    del self.held[other]
+
+    def expire(self, timeout):
+        """
+        Drops keys that saw no press or repeat for longer than timeout seconds,
+        in case their release was lost.
+        """
+        deadline = time.perf_counter() - timeout
+        with self.lock:
+            for key in [k for k, (_, seen, _) in self.held.items() if seen < deadline]:
+                del self.held[key]
+                self.expired += 1
+
+    def is_held(self, key):
+        """
+        Returns True if the key is held.
+        """
+        with self.lock:
+            return key in self.held
+
+    def held_keys(self):
+        """
+        Returns the held keys and their press times.
+        """
+        with self.lock:
+            return {key: pressed for key, (pressed, _, _) in self.held.items()}
+
+    def clear(self):
+        """
+        Forgets all held keys, e.g. when the listener is stopped.
+        """
+        with self.lock:
+            self.held.clear()
+
+    def stats(self):
+        """
+        Returns the press, ignored repeat and expired key counters.
+        """
+        return {'presses': self.presses, 'repeats': self.repeats, 'expired': self.expired}
+
+
+class CommandQueue:
+    """
+    Hands commands from the pynput listener threads to the Tk main loop.
+    Posting appends to a bounded deque; the first command posted into an
+    empty queue schedules a single drain with after(), so a flood of key
+    events cannot flood Tk with callbacks. Commands run in the order they
+    were posted; a command posted with merge=True is folded into an
+    identical mergeable command directly before it. Toggles are never
+    posted with merge=True, so two quick presses still toggle twice. Each
+    command keeps the time of the key event that posted it, for the input
+    latency counters.
+    """
+
+    def __init__(self, widget, maxlen=COMMAND_QUEUE_SIZE):
+        self.widget = widget
+        self.maxlen = maxlen
+        self.commands = deque()  # (func, args, merge, event time); append and popleft are thread-safe
+        self.wake_pending = False  # A drain is scheduled
+        self.event_time = None  # Key event time of the command being run
+        self.stopped = False
+
+        # Statistics
+        self.posted = 0  # Commands posted
+        self.merged = 0  # Commands folded into the identical command before them
+        self.dropped = 0  # Commands dropped because the queue was full or stopped
+        self.drains = 0  # Drains run on the Tk thread
+        self.latencies = 0  # Key events whose transform was applied
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def post(self, func, *args, merge=False):
+        """
+        Queues func(*args) to run on the Tk thread. Safe to call from any
+        thread. Pass merge=True only for commands where running twice in a
+        row has the same effect as running once.
+        """
+        self.posted += 1
+        if self.stopped or len(self.commands) >= self.maxlen:
+            self.dropped += 1
+            return
+        self.commands.append((func, args, merge, time.perf_counter()))
+        if not self.wake_pending:
+            self.wake_pending = True
+            self.widget.after(0, self.drain)
+
+    def drain(self):
+        """
+        Runs the queued commands in order on the Tk thread. A mergeable
+        command identical to the one before it is dropped; the earlier one
+        keeps the oldest event time.
+        """
+        # Cleared before popping, so a command posted meanwhile either is
+        # popped below or schedules the next drain
+        self.wake_pending = False
+        batch = []
+        while self.commands:
+            func, args, merge, event_time = self.commands.popleft()
+            if merge and batch and batch[-1][:3] == (func, args, True):
+                self.merged += 1
+                continue
+            batch.append((func, args, merge, event_time))
+        self.drains += 1
+        for func, args, _, event_time in batch:
+            if self.stopped:
+                return
+            self.event_time = event_time
+            try:
+                func(*args)
+            finally:
+                self.event_time = None
+
+    def record_latency(self, event_time):
+        """
+        Records the time from a key event to its transform being applied.
+        """
+        latency = time.perf_counter() - event_time
+        self.latencies += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def stop(self):
+        """
+        Drops queued commands and ignores further posts.
+        """
+        self.stopped = True
+        self.commands.clear()
+
+    def stats(self):
+        """
+        Returns the queue counters and the key-to-transform latency in ms.
+        """
+        return {
+            'posted': self.posted,
+            'merged': self.merged,
+            'dropped': self.dropped,
+            'drains': self.drains,
+            'latency_avg_ms': round(self.latency_total / self.latencies * 1000, 2) if self.latencies else 0.0,
+            'latency_max_ms': round(self.latency_max * 1000, 2),
+        }
+
+
+class BurstLog:
+    """
+    Aggregates repeated interaction messages into one INFO line per burst.
+    Each (action, image) pair is counted and its amounts summed until no
+    action has been recorded for BURST_LOG_IDLE_MS.
+    """
+
+    def __init__(self, widget, idle_ms=BURST_LOG_IDLE_MS):
+        self.widget = widget
+        self.idle_ms = idle_ms
+        self.bursts = {}  # (action, image name, unit) -> [count, total amount]
+        self.last_record = 0.0
+        self.flush_job = None
+
+    def record(self, action, name, amount, unit):
+        """
+        Counts one action on an image, e.g. record("Moved", "Ruler", 3, "px").
+        """
+        burst = self.bursts.setdefault((action, name, unit), [0, 0.0])
+        burst[0] += 1
+        burst[1] += amount
+        self.last_record = time.perf_counter()
+        if self.flush_job is None:
+            self.flush_job = self.widget.after(self.idle_ms, self.flush_when_idle)
+
+    def flush_when_idle(self):
+        """
+        Writes the bursts once no action was recorded for idle_ms.
+        """
+        self.flush_job = None
+        idle_ms = (time.perf_counter() - self.last_record) * 1000
+        if idle_ms < self.idle_ms:
+            self.flush_job = self.widget.after(int(self.idle_ms - idle_ms) + 1, self.flush_when_idle)
+            return
+        self.flush()
+
+    def flush(self):
+        """
+        Writes one summary line per burst.
+        """
+        if self.flush_job is not None:
+            self.widget.after_cancel(self.flush_job)
+            self.flush_job = None
+        for (action, name, unit), (count, total) in self.bursts.items():
+            logging.info("%s image '%s' %d time(s), %.4g %s in total.", action, name, count, total, unit)
+        self.bursts.clear()
+
+
+class RenderWorker:
+    """
+    Renders layer rasters on a background thread so slow resamples never block
+    the Tk main loop. The layers of a frame are independent and are rendered
+    concurrently on a bounded thread pool; the frame is handed back once all
+    of its layers are ready, in the order they were submitted (z-order).
+    Each submitted frame carries a scene generation number; only the newest
+    pending frame is kept, so superseded requests are dropped before any work
+    is done. Results are handed back to the main thread with after(), where
+    the PhotoImage and canvas updates happen.
+    """
+
+    def __init__(self, widget, on_result, max_threads=RENDER_THREADS):
+        self.widget = widget
+        self.on_result = on_result  # Called as on_result(generation, results) on the main thread
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="RenderPool")
+        self.condition = threading.Condition()
+        self.pending = None  # (generation, jobs) of the newest unstarted frame
+        self.running = True
+        self.superseded = 0  # Frames dropped before rendering because a newer one arrived
+        self.thread = threading.Thread(target=self.run, name="RenderWorker", daemon=True)
+        self.thread.start()
+
+    def submit(self, generation, jobs):
+        """
+        Queues a frame of (image_state, key) jobs, replacing any frame that has
+        not been started yet.
+        """
+        with self.condition:
+            if self.pending is not None:
+                self.superseded += 1
+            self.pending = (generation, jobs)
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                generation, jobs = self.pending
+                self.pending = None
+
+            try:
+                rasters = render_jobs(jobs, self.executor)
+            except RuntimeError:
+                # The pool was shut down while stopping
+                return
+            # A None raster marks the key as failed
+            results = [(image_state, key, raster) for (image_state, key), raster in zip(jobs, rasters)]
+            try:
+                self.widget.after(0, self.on_result, generation, results)
+            except (RuntimeError, tk.TclError):
+                # The main loop has gone away
+                return
+
+    def stop(self):
+        """
+        Stops the worker thread once the current frame is done.
+        """
+        with self.condition:
+            self.running = False
+            self.pending = None
+            self.condition.notify()
+        self.executor.shutdown(wait=False)
+
+
+class ImageState(LayerState):
+    """
+    A layer of the overlay plus the Tk photo and canvas items that show it.
+    """
+
+    def __init__(self, image_original, name, source_path=None, size=None):
+        super().__init__(image_original, name, source_path, size)
+        self.image_display = None  # PhotoBuffer of the raster shown
+
+        # Persistent canvas items and the key of the raster they currently show
+        self.canvas_item = None
+        self.marker_item = None
+        self.raster_key = None
+        self.raster_origin = (0, 0)
+        self.raster_image = None  # PIL raster shown, used by the composited frame mode
+        self.failed_key = None  # Render key whose render raised; not retried until the key changes
 
 
 class ImageOverlayApp:
@@ -65,6 +505,14 @@ class ImageOverlayApp:
         # Path to the Images directory
         self.images_dir = os.path.join(self.base_dir, "Images")
 
+        # Decode the bundled templates in the background once the UI is up
+        self.template_preloader = TemplatePreloader(
+            self.open_image_file,
+            [os.path.join(self.images_dir, filename) for filename in TEMPLATE_FILES],
+            os.path.join(default_cache_dir(), 'template_usage.json'),
+        )
+        self.root.after_idle(self.template_preloader.start)
+
         # Dictionary to store ImageState objects
         self.images = {}
         self.active_image_name = None  # Name of the active image
@@ -76,14 +524,26 @@ class ImageOverlayApp:
         self.is_dragging = False
         self.is_rotation_point_mode = False  # Rotation point selection mode
 
+        # Interactive rendering state
+        self.interacting = False  # True while drags, wheel zooms or nudges are active
+        self.settle_job = None  # Pending high-quality re-render
+
         # Additional windows
         self.additional_windows = []
 
         # Control mode variables
         self.control_mode = False  # Flag to track if control mode is active
         self.keyboard_listener = None
+        self.key_tracker = KeyStateTracker()  # Keys held while in control mode, including Alt
+        self.motion_job = None  # Pending motion tick
+        self.motion_last_tick = 0.0
+        self.motion_ticks = 0  # Motion ticks that moved the image
 
-        self.alt_pressed = False  # To track the Alt key state
+        # Work posted by the pynput listener threads runs on the Tk thread
+        self.command_queue = CommandQueue(self.root)
+
+        # Per-action messages are summarized per burst
+        self.burst_log = BurstLog(self.root)
 
         # Initialize the GUI
         self.setup_buttons_window()
@@ -136,20 +596,25 @@ class ImageOverlayApp:
         """
         # Ctrl + Alt + 1 to start/stop Control Mode
         def toggle_control_mode_hotkey():
-            self.root.after(0, self.toggle_control_mode)
+            self.command_queue.post(self.toggle_control_mode)
             logging.info("Global hotkey 'Ctrl+Alt+1' pressed for toggling control mode.")
 
         def toggle_image_window_hotkey():
-            self.root.after(0, self.toggle_image_window)
+            self.command_queue.post(self.toggle_image_window)
             logging.info("Global hotkey 'Ctrl+Alt+2' pressed for toggling image window.")
 
+        def toggle_composite_mode_hotkey():
+            self.command_queue.post(self.toggle_composite_mode)
+            logging.info("Global hotkey 'Ctrl+Alt+3' pressed for toggling composited frame mode.")
+
         def reset_app_hotkey():
-            self.root.after(0, self.reset_app)
+            self.command_queue.post(self.reset_app, merge=True)
             logging.info("Global hotkey 'Ctrl+Alt+Shift+R' pressed for resetting application.")
 
         self.global_hotkey_listener = keyboard.GlobalHotKeys({
             '<ctrl>+<alt>+1': toggle_control_mode_hotkey,
             '<ctrl>+<alt>+2': toggle_image_window_hotkey,
+            '<ctrl>+<alt>+3': toggle_composite_mode_hotkey,
             '<ctrl>+<alt>+<shift>+r': reset_app_hotkey,
         })
         self.global_hotkey_listener.start()
@@ -252,6 +717,42 @@ class ImageOverlayApp:
         # Force update to get accurate canvas size
         self.image_window.update_idletasks()
 
+        # Coalesce redraw requests into at most one render per frame
+        self.render_scheduler = RenderScheduler(self.canvas, self.draw_images)
+
+        # Pointer input is summed between frames and applied once per render
+        self.input_accumulator = InputAccumulator()
+
+        # Canvas items whose stacking order is up to date
+        self.stacked_items = set()
+
+        # Tk photos are reused between frames; see PhotoBuffer
+        self.photo_stats = {'allocations': 0, 'pastes': 0, 'blanks': 0}
+
+        # Optional single composited frame instead of one canvas item per layer
+        self.composite_mode = COMPOSITE_FRAME and NUMPY_AVAILABLE
+        self.compositor = FrameCompositor() if NUMPY_AVAILABLE else None
+        self.frame_item = None
+        self.frame_display = None  # PhotoBuffer of the composited frame
+        self.frame_layers = None  # (raster, x, y) of the frame on screen
+        self.frame_groups = {}  # Flattened layers below / above the active image
+
+        # Rasterize on a background thread; results come back through after()
+        self.render_generation = 0  # Generation of the most recently submitted frame
+        self.displayed_generation = 0  # Generation of the most recently displayed result
+        self.stale_results = 0  # Results dropped because a newer one was already displayed
+        self.render_failures = 0  # Layer renders that raised
+        self.render_worker = RenderWorker(self.canvas, self.apply_render_results)
+
+        # Re-rasterize SVG templates at the zoom level on a separate thread
+        self.vector_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VectorRender")
+        self.vector_pending = set()  # (image name, bucket) being rasterized
+        self.vector_failed = set()  # (image name, bucket) that could not be rasterized
+
+        # Full-resolution decodes of user images shown as a preview first
+        self.decode_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ImageDecode")
+        self.load_timers = {}  # ImageState -> (preview decode seconds, perf_counter() when named)
+
         # Bind mouse events
         self.bind_canvas_events()
 
@@ -427,7 +928,7 @@ class ImageOverlayApp:
         Decorator to log button presses.
         """
         def wrapper(*args, **kwargs):
-            logging.info(f"Button pressed: {func.__name__}")
+            logging.info("Button pressed: %s", func.__name__)
             return func(*args, **kwargs)
         return wrapper
 
@@ -439,6 +940,7 @@ class ImageOverlayApp:
         Binds mouse and keyboard events to the canvas for user interaction.
         """
         self.canvas.bind("<ButtonPress-1>", self.on_mouse_down)
+        self.canvas.bind("<Shift-ButtonPress-1>", self.on_pick_click)
         self.canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
         self.canvas.bind("<B1-Motion>", self.on_mouse_move)
         self.canvas.bind("<ButtonRelease-1>", self.on_canvas_click)
@@ -458,7 +960,7 @@ class ImageOverlayApp:
         Adjusts the canvas size when the image window is resized.
         """
         self.canvas.config(width=event.width, height=event.height)
-        self.draw_images()
+        self.request_render()
 
     ####################################################################################################################################################################################
     ###                                                             --- Transparency Control Methods ---                                                                            ###
@@ -474,12 +976,12 @@ class ImageOverlayApp:
         if active_image.image_transparency_level > 0.2:
             active_image.image_transparency_level = 0.2
             self.btn_toggle_transparency.config(text="Max Transp")
-            logging.info(f"Transparency of image '{active_image.name}' set to minimum.")
+            logging.info("Transparency of image '%s' set to minimum.", active_image.name)
         else:
             active_image.image_transparency_level = 1.0
             self.btn_toggle_transparency.config(text="Min Transp")
-            logging.info(f"Transparency of image '{active_image.name}' set to maximum.")
-        self.draw_images()
+            logging.info("Transparency of image '%s' set to maximum.", active_image.name)
+        self.request_render()
 
     def update_transparency_button(self):
         """
@@ -505,12 +1007,12 @@ class ImageOverlayApp:
         if filepath:
             image_original = self.open_image_file(filepath)
             if image_original:
-                image_state = ImageState(image_original, image_name)
+                image_state = ImageState(image_original, image_name, filepath)
                 self.images[image_name] = image_state
                 self.active_image_name = image_name
                 self.update_active_image_menu()
                 self.active_image_var.set(image_name)
-                self.draw_images()
+                self.request_render()
 
                 logging.info(f"Image '{image_name}' loaded from '{filepath}'.")
 
@@ -523,9 +1025,8 @@ class ImageOverlayApp:
         """
         try:
             if filepath.lower().endswith('.svg'):
-                # Convert SVG to PNG using cairosvg
-                png_data = cairosvg.svg2png(url=filepath)
-                image_original = Image.open(io.BytesIO(png_data)).convert("RGBA")
+                # Rasterize the SVG, or load it from the disk cache
+                image_original = rasterize_svg(filepath)
             else:
                 image_original = Image.open(filepath).convert("RGBA")
             return image_original
@@ -533,6 +1034,51 @@ class ImageOverlayApp:
             logging.error(f"Error loading image: {e}")
             return None
 
+    def open_user_image(self, filepath):
+        """
+        Opens a user-selected image. Raster images larger than the screen are
+        first decoded at reduced resolution so they can be shown right away;
+        the full-resolution decode continues on the decode thread.
+        Returns the image, the full-resolution size and the future of the
+        full decode (both None when the image is already complete).
+        """
+        if filepath.lower().endswith('.svg'):
+            return self.open_image_file(filepath), None, None
+        try:
+            started = time.perf_counter()
+            max_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+            preview, full_size = open_reduced(filepath, max_size)
+        except Exception as e:
+            logging.error(f"Error loading image: {e}")
+            return None, None, None
+        if preview.size == full_size:
+            return preview, None, None
+        logging.info(
+            f"Decoded {preview.width}x{preview.height} preview of {full_size[0]}x{full_size[1]} "
+            f"image in {(time.perf_counter() - started) * 1000:.0f} ms."
+        )
+        return preview, full_size, self.decode_executor.submit(self.open_image_file, filepath)
+
+    def on_full_decode_ready(self, image_state, future):
+        """
+        Replaces a preview with its full-resolution decode. Called on the main thread.
+        """
+        image = None if future.cancelled() else future.result()
+        if self.images.get(image_state.name) is not image_state:
+            return
+        if image is None:
+            logging.error(f"Full-resolution decode of image '{image_state.name}' failed; keeping the preview.")
+            return
+        image_state.replace_original(image)
+        logging.info(f"Full-resolution image '{image_state.name}' swapped in.")
+        self.request_render()
+
+    def open_template_image(self, filepath):
+        """
+        Returns a bundled template, preloaded in the background when possible.
+        """
+        return self.template_preloader.get(filepath)
+
     # Updated method names and image keys to reflect actual image names
 
     def load_default_ruler_image(self):
@@ -541,9 +1087,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'liniar_new_n2.svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Ruler")
+                image_state = ImageState(image_original, "Ruler", filepath)
                 self.images["Ruler"] = image_state
 
                 # Center the Ruler image
@@ -551,7 +1097,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Ruler image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Ruler' image loaded.")
 
@@ -566,9 +1112,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'Normal(medium).svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Normal")
+                image_state = ImageState(image_original, "Normal", filepath)
                 self.images["Normal"] = image_state
 
                 # Center the Normal image
@@ -576,7 +1122,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Normal image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Normal' image loaded.")
 
@@ -591,9 +1137,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'Tapered.svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Tapered")
+                image_state = ImageState(image_original, "Tapered", filepath)
                 self.images["Tapered"] = image_state
 
                 # Center the Tapered image
@@ -601,7 +1147,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Tapered image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Tapered' image loaded.")
 
@@ -616,9 +1162,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'Ovoide.svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Ovoide")
+                image_state = ImageState(image_original, "Ovoide", filepath)
                 self.images["Ovoide"] = image_state
 
                 # Center the Ovoide image
@@ -626,7 +1172,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Ovoide image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Ovoide' image loaded.")
 
@@ -641,9 +1187,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'NarrowTapered.svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Narrow Tapered")
+                image_state = ImageState(image_original, "Narrow Tapered", filepath)
                 self.images["Narrow Tapered"] = image_state
 
                 # Center the Narrow Tapered image
@@ -651,7 +1197,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Narrow Tapered image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Narrow Tapered' image loaded.")
 
@@ -666,9 +1212,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'NarrowOvoide.svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Narrow Ovoide")
+                image_state = ImageState(image_original, "Narrow Ovoide", filepath)
                 self.images["Narrow Ovoide"] = image_state
 
                 # Center the Narrow Ovoide image
@@ -676,7 +1222,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Narrow Ovoide image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Narrow Ovoide' image loaded.")
 
@@ -691,9 +1237,9 @@ class ImageOverlayApp:
         """
         filepath = os.path.join(self.images_dir, 'angulation.svg')
         if os.path.exists(filepath):
-            image_original = self.open_image_file(filepath)
+            image_original = self.open_template_image(filepath)
             if image_original:
-                image_state = ImageState(image_original, "Angulation")
+                image_state = ImageState(image_original, "Angulation", filepath)
                 self.images["Angulation"] = image_state
 
                 # Center the Angulation image
@@ -701,7 +1247,7 @@ class ImageOverlayApp:
 
                 # Do not change the active image when loading the Angulation image
                 self.update_active_image_menu()
-                self.draw_images()
+                self.request_render()
 
                 logging.info("Default 'Angulation' image loaded.")
 
@@ -740,7 +1286,7 @@ class ImageOverlayApp:
         """
         self.active_image_name = value
         self.update_transparency_button()
-        logging.info(f"Active image changed to '{value}'.")
+        logging.info("Active image changed to '%s'.", value)
 
     def toggle_image_window(self):
         """
@@ -773,7 +1319,7 @@ class ImageOverlayApp:
                 self.images["Ruler"].visible = True
                 # Center the image
                 self.center_ruler_image()
-                self.draw_images()
+                self.request_render()
             self.ruler_visible = True
             self.btn_open_ruler.config(text="Hide Ruler")
             logging.info("Ruler image made visible.")
@@ -790,7 +1336,7 @@ class ImageOverlayApp:
             # Hide the Ruler image
             if "Ruler" in self.images:
                 self.images["Ruler"].visible = False
-                self.draw_images()
+                self.request_render()
             self.ruler_visible = False
             self.btn_open_ruler.config(text="Ruler")
             logging.info("Ruler image hidden.")
@@ -815,7 +1361,7 @@ class ImageOverlayApp:
                 self.images["Normal"].visible = True
                 # Center the image
                 self.center_normal_image()
-                self.draw_images()
+                self.request_render()
             self.normal_visible = True
             self.btn_open_normal.config(text="Hide Normal")
             logging.info("Normal image made visible.")
@@ -832,7 +1378,7 @@ class ImageOverlayApp:
             # Hide the Normal image
             if "Normal" in self.images:
                 self.images["Normal"].visible = False
-                self.draw_images()
+                self.request_render()
             self.normal_visible = False
             self.btn_open_normal.config(text="Normal")
             logging.info("Normal image hidden.")
@@ -857,7 +1403,7 @@ class ImageOverlayApp:
                 self.images["Tapered"].visible = True
                 # Center the image
                 self.center_tapered_image()
-                self.draw_images()
+                self.request_render()
             self.tapered_visible = True
             self.btn_open_tapered.config(text="Hide Tapered")
             logging.info("Tapered image made visible.")
@@ -874,7 +1420,7 @@ class ImageOverlayApp:
             # Hide the Tapered image
             if "Tapered" in self.images:
                 self.images["Tapered"].visible = False
-                self.draw_images()
+                self.request_render()
             self.tapered_visible = False
             self.btn_open_tapered.config(text="Tapered")
             logging.info("Tapered image hidden.")
@@ -899,7 +1445,7 @@ class ImageOverlayApp:
                 self.images["Ovoide"].visible = True
                 # Center the image
                 self.center_ovoide_image()
-                self.draw_images()
+                self.request_render()
             self.ovoide_visible = True
             self.btn_open_ovoide.config(text="Hide Ovoide")
             logging.info("Ovoide image made visible.")
@@ -916,7 +1462,7 @@ class ImageOverlayApp:
             # Hide the Ovoide image
             if "Ovoide" in self.images:
                 self.images["Ovoide"].visible = False
-                self.draw_images()
+                self.request_render()
             self.ovoide_visible = False
             self.btn_open_ovoide.config(text="Ovoide")
             logging.info("Ovoide image hidden.")
@@ -941,7 +1487,7 @@ class ImageOverlayApp:
                 self.images["Narrow Tapered"].visible = True
                 # Center the image
                 self.center_narrow_tapered_image()
-                self.draw_images()
+                self.request_render()
             self.narrow_tapered_visible = True
             self.btn_open_narrow_tapered.config(text="Hide Narrow Tapered")
             logging.info("Narrow Tapered image made visible.")
@@ -958,7 +1504,7 @@ class ImageOverlayApp:
             # Hide the Narrow Tapered image
             if "Narrow Tapered" in self.images:
                 self.images["Narrow Tapered"].visible = False
-                self.draw_images()
+                self.request_render()
             self.narrow_tapered_visible = False
             self.btn_open_narrow_tapered.config(text="Narrow Tapered")
             logging.info("Narrow Tapered image hidden.")
@@ -983,7 +1529,7 @@ class ImageOverlayApp:
                 self.images["Narrow Ovoide"].visible = True
                 # Center the image
                 self.center_narrow_ovoide_image()
-                self.draw_images()
+                self.request_render()
             self.narrow_ovoide_visible = True
             self.btn_open_narrow_ovoide.config(text="Hide Narrow Ovoide")
             logging.info("Narrow Ovoide image made visible.")
@@ -1000,7 +1546,7 @@ class ImageOverlayApp:
             # Hide the Narrow Ovoide image
             if "Narrow Ovoide" in self.images:
                 self.images["Narrow Ovoide"].visible = False
-                self.draw_images()
+                self.request_render()
             self.narrow_ovoide_visible = False
             self.btn_open_narrow_ovoide.config(text="Narrow Ovoide")
             logging.info("Narrow Ovoide image hidden.")
@@ -1025,7 +1571,7 @@ class ImageOverlayApp:
                 self.images["Angulation"].visible = True
                 # Center the image
                 self.center_angulation_image()
-                self.draw_images()
+                self.request_render()
             self.angulation_visible = True
             self.btn_angulation.config(text="Hide Angulation")
             logging.info("Angulation image made visible.")
@@ -1042,7 +1588,7 @@ class ImageOverlayApp:
             # Hide the Angulation image
             if "Angulation" in self.images:
                 self.images["Angulation"].visible = False
-                self.draw_images()
+                self.request_render()
             self.angulation_visible = False
             self.btn_angulation.config(text="Angulation")
             logging.info("Angulation image hidden.")
@@ -1057,66 +1603,381 @@ class ImageOverlayApp:
     ####################################################################################################################################################################################
     ###                                                             --- Image Drawing Methods ---                                                                                   ###
     ####################################################################################################################################################################################
+    def request_render(self):
+        """
+        Requests a redraw. Requests are coalesced into one render per frame.
+        """
+        self.render_scheduler.request()
+
     def draw_images(self):
         """
-        Clears the canvas and redraws all visible images.
+        Updates the canvas items of all visible images. Items are kept between
+        frames; pure translations just move the existing item. Layers whose
+        pixel-affecting parameters changed are shown from the render cache or
+        sent to the render worker as one frame.
         """
-        self.canvas.delete("all")
+        self.apply_pointer_input()
+        live_items = set()
+        jobs = []
         for image_state in self.images.values():
             if image_state.visible:
-                self.draw_image(image_state)
+                job = self.draw_image(image_state)
+                if job is not None:
+                    jobs.append(job)
+                live_items.update(item for item in (image_state.canvas_item, image_state.marker_item) if item is not None)
+            else:
+                self.remove_image_items(image_state)
+
+        if self.composite_mode:
+            self.show_composite_frame()
+            if self.frame_item is not None:
+                live_items.add(self.frame_item)
+
+        # Remove items of images that are no longer loaded
+        for item in self.canvas.find_withtag("layer"):
+            if item not in live_items:
+                self.canvas.delete(item)
+
+        if live_items != self.stacked_items:
+            self.restack_items()
+
+        if jobs:
+            self.render_generation += 1
+            self.render_worker.submit(self.render_generation, jobs)
+
+        self.enforce_pyramid_budget()
         self.image_window.update_idletasks()
 
-    def draw_image(self, image_state):
+    def restack_items(self):
+        """
+        Keeps the stacking order of the canvas items in sync with the image order.
+        """
+        self.stacked_items = set()
+        if self.frame_item is not None:
+            self.canvas.tag_raise(self.frame_item)
+            self.stacked_items.add(self.frame_item)
+        for image_state in self.images.values():
+            if image_state.visible:
+                for item in (image_state.canvas_item, image_state.marker_item):
+                    if item is not None:
+                        self.canvas.tag_raise(item)
+                        self.stacked_items.add(item)
+
+    def remove_image_items(self, image_state):
         """
-        Applies transformations to an image and draws it on the canvas.
+        Deletes the canvas items of an image.
         """
-        # Apply transformations
-        img = image_state.image_original.copy()
+        if image_state.canvas_item is not None:
+            self.canvas.delete(image_state.canvas_item)
+        if image_state.marker_item is not None:
+            self.canvas.delete(image_state.marker_item)
+        image_state.canvas_item = None
+        image_state.marker_item = None
+        image_state.raster_key = None
+        image_state.raster_image = None
+        image_state.image_display = None
 
-        # Apply transparency
-        if image_state.image_transparency_level < 1.0:
-            alpha = img.getchannel('A')
-            alpha = alpha.point(lambda p: int(p * image_state.image_transparency_level))
-            img.putalpha(alpha)
+    def enforce_pyramid_budget(self):
+        """
+        Evicts the least recently used pyramid levels across all images while
+        their total size is over PYRAMID_MEMORY_BUDGET.
+        """
+        total = sum(state.pyramid_bytes() for state in self.images.values())
+        if total <= PYRAMID_MEMORY_BUDGET:
+            return
+        levels = []
+        for name, state in self.images.items():
+            with state.lock:
+                levels.extend(
+                    (last_used, name, level)
+                    for level, last_used in state.pyramid_last_used.items() if level > 0
+                )
+        for last_used, name, level in sorted(levels):
+            if total <= PYRAMID_MEMORY_BUDGET:
+                break
+            state = self.images[name]
+            image = state.pyramid.get(level)
+            if image is None:
+                continue
+            total -= image.width * image.height * len(image.getbands())
+            state.evict_pyramid_level(level)
+            logging.debug("Evicted pyramid level %s of image '%s'.", level, name)
 
-        # Resize
-        img = img.resize(
-            (int(img.width * image_state.scale), int(img.height * image_state.scale)),
-            Image.LANCZOS
-        )
+    def draw_image(self, image_state):
+        """
+        Updates the canvas items of an image. The raster is taken from the
+        render cache when possible; otherwise the current raster stays on
+        screen and a render job (image_state, key) is returned for the worker.
+        While input is active, a cached high-quality raster is still preferred.
+        """
+        viewport = (0, 0, self.canvas.winfo_width(), self.canvas.winfo_height())
+        key = image_state.render_key(SETTLED_RESAMPLE, viewport)
+        if self.interacting and key not in image_state.render_cache:
+            # Use the cheap filter while input is active; a settled re-render follows
+            key = image_state.render_key(INTERACTIVE_RESAMPLE, viewport)
+
+        # Zoomed-in SVG: produce a crisp raster in the background; the bitmap
+        # is resampled until it is ready
+        bucket = image_state.vector_bucket_for_scale(image_state.scale)
+        if bucket is not None and not image_state.has_vector_raster(bucket):
+            self.request_vector_raster(image_state, bucket)
+
+        job = None
+        if key != image_state.raster_key and key != image_state.failed_key:
+            cached = image_state.render_cache.get(key)
+            if cached is None:
+                job = (image_state, key)
+            else:
+                self.show_raster(image_state, key, cached)
 
-        # Apply flips
-        if image_state.is_flipped_horizontally:
-            img = img.transpose(Image.FLIP_LEFT_RIGHT)
-        if image_state.is_flipped_vertically:
-            img = img.transpose(Image.FLIP_TOP_BOTTOM)
+        # Place the raster's bounding box relative to the offset
+        if image_state.canvas_item is not None:
+            self.canvas.coords(image_state.canvas_item, *self.raster_canvas_position(image_state))
 
-        # Rotate around the rotation point if set
+        # Draw a marker at the rotation point if set
         if image_state.rotation_point:
-            rotation_center = (
-                image_state.rotation_point[0] - (image_state.offset_x - img.width / 2),
-                image_state.rotation_point[1] - (image_state.offset_y - img.height / 2)
+            radius = 1.5  # Marker size
+            marker_coords = (
+                image_state.rotation_point[0] - radius, image_state.rotation_point[1] - radius,
+                image_state.rotation_point[0] + radius, image_state.rotation_point[1] + radius
+            )
+            if image_state.marker_item is None:
+                image_state.marker_item = self.canvas.create_oval(
+                    *marker_coords, fill='red', outline='', tags=("layer",)
+                )
+            else:
+                self.canvas.coords(image_state.marker_item, *marker_coords)
+        elif image_state.marker_item is not None:
+            self.canvas.delete(image_state.marker_item)
+            image_state.marker_item = None
+
+        return job
+
+    def show_raster(self, image_state, key, raster):
+        """
+        Puts a rendered raster on the canvas. Runs on the main thread only.
+        """
+        img, left, top = raster
+        timer = self.load_timers.pop(image_state, None)
+        if timer is not None:
+            decode_time, name_entered = timer
+            logging.info(
+                f"First pixels of image '{image_state.name}' shown: decoded in {decode_time * 1000:.0f} ms "
+                f"after the file dialog closed, drawn {(time.perf_counter() - name_entered) * 1000:.0f} ms "
+                f"after the name prompt closed."
+            )
+        image_state.raster_key = key
+        image_state.raster_origin = (left, top)
+        image_state.raster_image = img
+        if self.composite_mode:
+            # Blended into the frame by show_composite_frame
+            return
+        if image_state.image_display is None:
+            image_state.image_display = PhotoBuffer(self.photo_stats)
+        reallocated = image_state.image_display.update(img)
+        x, y = self.raster_canvas_position(image_state)
+        if image_state.canvas_item is None:
+            image_state.canvas_item = self.canvas.create_image(
+                x, y, image=image_state.image_display.photo, anchor='nw', tags=("layer",)
             )
-            img = img.rotate(image_state.angle, expand=True, center=rotation_center)
         else:
-            img = img.rotate(image_state.angle, expand=True)
+            if reallocated:
+                self.canvas.itemconfigure(image_state.canvas_item, image=image_state.image_display.photo)
+            self.canvas.coords(image_state.canvas_item, x, y)
+
+    @staticmethod
+    def raster_canvas_position(image_state):
+        """
+        Returns the canvas position of the raster shown for an image.
+        """
+        left, top = image_state.raster_origin
+        return image_state.raster_position(image_state.raster_key[2], left, top)
+
+    def show_composite_frame(self):
+        """
+        Blends the current raster of every visible image into one frame and
+        shows it as a single canvas item. Nothing is redone when no raster
+        changed or moved since the last frame. The images below and above the
+        active one are flattened once and reused while only the active image
+        changes.
+        """
+        layers = []
+        active_index = None
+        for name, image_state in self.images.items():
+            if image_state.visible and image_state.raster_image is not None:
+                if name == self.active_image_name:
+                    active_index = len(layers)
+                x, y = self.raster_canvas_position(image_state)
+                layers.append((image_state.raster_image, round(x), round(y)))
+        # Holding the rasters keeps their ids unique while they are compared
+        if self.frame_layers is not None and self.same_layers(layers, self.frame_layers):
+            return
+        self.frame_layers = layers
 
-        image_state.image_display = ImageTk.PhotoImage(img)
+        viewport = (0, 0, self.canvas.winfo_width(), self.canvas.winfo_height())
+        if active_index is None:
+            frame_layers = layers
+        else:
+            frame_layers = (
+                self.flattened_group('below', layers[:active_index], viewport)
+                + [layers[active_index]]
+                + self.flattened_group('above', layers[active_index + 1:], viewport)
+            )
+        frame = self.compositor.compose(frame_layers, viewport)
+        if frame is None:
+            self.remove_frame_item()
+            return
+        img, left, top = frame
+        if self.frame_display is None:
+            self.frame_display = PhotoBuffer(self.photo_stats)
+        reallocated = self.frame_display.update(img)
+        if self.frame_item is None:
+            self.frame_item = self.canvas.create_image(
+                left, top, image=self.frame_display.photo, anchor='nw', tags=("layer",)
+            )
+        else:
+            if reallocated:
+                self.canvas.itemconfigure(self.frame_item, image=self.frame_display.photo)
+            self.canvas.coords(self.frame_item, left, top)
 
-        # Draw the image at the offset position
-        self.canvas.create_image(
-            image_state.offset_x, image_state.offset_y, image=image_state.image_display
+    @staticmethod
+    def same_layers(layers, previous):
+        """
+        Returns True if both lists hold the same rasters at the same positions.
+        """
+        return len(layers) == len(previous) and all(
+            new[0] is old[0] and new[1:] == old[1:] for new, old in zip(layers, previous)
         )
 
-        # Draw a marker at the rotation point if set
-        if image_state.rotation_point:
-            radius = 1.5  # Marker size
-            self.canvas.create_oval(
-                image_state.rotation_point[0] - radius, image_state.rotation_point[1] - radius,
-                image_state.rotation_point[0] + radius, image_state.rotation_point[1] + radius,
-                fill='red', outline=''
-            )
+    def flattened_group(self, group, layers, viewport):
+        """
+        Returns the layers as a list of at most one flattened block. The block
+        is kept and reused until a raster in the group changes or moves.
+        """
+        if len(layers) < 2:
+            return layers
+        cached = self.frame_groups.get(group)
+        if cached is not None and cached[1] == viewport and self.same_layers(layers, cached[0]):
+            block = cached[2]
+        else:
+            block = self.compositor.flatten(layers, viewport)
+            self.frame_groups[group] = (layers, viewport, block)
+        return [block] if block is not None else []
+
+    def remove_frame_item(self):
+        """
+        Deletes the composited frame from the canvas.
+        """
+        if self.frame_item is not None:
+            self.canvas.delete(self.frame_item)
+        self.frame_item = None
+        self.frame_display = None
+        self.frame_layers = None
+        self.frame_groups = {}
+
+    def toggle_composite_mode(self):
+        """
+        Switches between one canvas item per image and a single composited
+        frame. The composited mode needs NumPy.
+        """
+        if not NUMPY_AVAILABLE:
+            messagebox.showwarning("NumPy Required", "The composited frame mode requires NumPy.")
+            return
+        self.composite_mode = not self.composite_mode
+        for image_state in self.images.values():
+            self.remove_image_items(image_state)
+        self.remove_frame_item()
+        self.request_render()
+        logging.info("Composited frame mode %s.", 'enabled' if self.composite_mode else 'disabled')
+
+    def request_vector_raster(self, image_state, bucket):
+        """
+        Rasterizes an SVG image at a scale bucket on the vector render thread,
+        then requests a redraw.
+        """
+        pending_key = (image_state.name, bucket)
+        if pending_key in self.vector_pending or pending_key in self.vector_failed:
+            return
+        self.vector_pending.add(pending_key)
+        future = self.vector_executor.submit(image_state.vector_raster, bucket)
+        future.add_done_callback(
+            lambda f: self.canvas.after(0, self.on_vector_raster_ready, image_state, bucket, f)
+        )
+
+    def on_vector_raster_ready(self, image_state, bucket, future):
+        """
+        Called on the main thread once a vector raster has been produced.
+        """
+        self.vector_pending.discard((image_state.name, bucket))
+        error = future.exception()
+        if error is not None:
+            self.vector_failed.add((image_state.name, bucket))
+            logging.error(f"Error rasterizing SVG for image '{image_state.name}' at x{bucket}: {error}")
+            return
+        logging.debug("SVG for image '%s' rasterized at x%s.", image_state.name, bucket)
+        self.request_render()
+
+    def apply_render_results(self, generation, results):
+        """
+        Displays the rasters of a finished frame. Results older than the most
+        recently displayed frame are discarded. A result may be older than the
+        latest request; it is still shown so continuous input is not starved,
+        and the newer frame replaces it when it finishes. A key whose render
+        failed is remembered, so it is not resubmitted every frame; another
+        frame is only requested when something was shown.
+        """
+        if generation <= self.displayed_generation:
+            self.stale_results += 1
+            return
+        self.displayed_generation = generation
+        shown = False
+        for image_state, key, raster in results:
+            if raster is None:
+                image_state.failed_key = key
+                self.render_failures += 1
+                continue
+            # Skip images that were hidden, reset or replaced in the meantime
+            if self.images.get(image_state.name) is not image_state or not image_state.visible:
+                continue
+            self.show_raster(image_state, key, raster)
+            shown = True
+        if shown:
+            self.request_render()
+
+    def begin_interaction(self):
+        """
+        Switches to interactive-quality rendering and (re)schedules the
+        high-quality re-render for when input has been idle for SETTLE_DELAY_MS.
+        """
+        self.interacting = True
+        if self.settle_job is not None:
+            self.canvas.after_cancel(self.settle_job)
+        self.settle_job = self.canvas.after(SETTLE_DELAY_MS, self.end_interaction)
+
+    def end_interaction(self):
+        """
+        Leaves interactive mode and re-renders at full quality.
+        """
+        self.settle_job = None
+        self.interacting = False
+        self.request_render()
+
+    def get_render_cache_stats(self):
+        """
+        Returns the render cache hit/miss counters for every loaded image,
+        and the tile cache counters for tiled images.
+        """
+        stats = {name: state.render_cache.stats() for name, state in self.images.items()}
+        for name, state in self.images.items():
+            if state.tiled:
+                stats[f"{name} (tiles)"] = state.tile_cache.stats()
+        return stats
+
+    def get_photo_stats(self):
+        """
+        Returns how often Tk photos were allocated, pasted into and blanked.
+        """
+        return dict(self.photo_stats)
 
     ####################################################################################################################################################################################
     ###                                                             --- Mouse and Keyboard Handlers ---                                                                             ###
@@ -1129,18 +1990,19 @@ class ImageOverlayApp:
             self.is_dragging = True
             self.start_x = event.x_root
             self.start_y = event.y_root
-            logging.debug(f"Mouse down at ({self.start_x}, {self.start_y}).")
+            logging.debug("Mouse down at (%s, %s).", self.start_x, self.start_y)
 
     def on_mouse_up(self, event):
         """
         Handles the event when the left mouse button is released.
         """
         self.is_dragging = False
-        logging.debug(f"Mouse up at ({event.x_root}, {event.y_root}).")
+        logging.debug("Mouse up at (%s, %s).", event.x_root, event.y_root)
 
     def on_mouse_move(self, event):
         """
         Handles the event when the mouse is moved while a button is pressed.
+        The movement is accumulated and applied on the next render.
         """
         active_image = self.get_active_image()
         if self.is_dragging and active_image:
@@ -1148,17 +2010,14 @@ class ImageOverlayApp:
             dy = event.y_root - self.start_y
 
             if event.state & 0x0004:  # If Ctrl key is held down
-                active_image.angle += dx * 0.1  # Reduced rotation sensitivity
-                active_image.angle %= 360  # Keep angle within 0-360 degrees
-                logging.debug(f"Rotating image '{active_image.name}' by {dx * 0.1} degrees.")
+                self.accumulate_pointer_input(active_image.name, angle=dx * 0.1)  # Reduced rotation sensitivity
             else:
-                active_image.offset_x += dx
-                active_image.offset_y += dy
-                logging.debug(f"Moving image '{active_image.name}' by ({dx}, {dy}).")
+                self.accumulate_pointer_input(active_image.name, dx=dx, dy=dy)
 
             self.start_x = event.x_root
             self.start_y = event.y_root
-            self.draw_images()
+            self.begin_interaction()
+            self.request_render()
 
     def on_canvas_click(self, event):
         """
@@ -1170,8 +2029,27 @@ class ImageOverlayApp:
             active_image.rotation_point = (event.x, event.y)
             self.is_rotation_point_mode = False
             self.btn_set_rotation_point.config(text="Set Rot Pt")
-            self.draw_images()
-            logging.info(f"Rotation point set for image '{active_image.name}' at ({event.x}, {event.y}).")
+            self.request_render()
+            logging.info("Rotation point set for image '%s' at (%s, %s).", active_image.name, event.x, event.y)
+
+    def pick_image(self, x, y):
+        """
+        Returns the name of the topmost visible image with a non-transparent
+        pixel at the canvas point, or None.
+        """
+        for name, image_state in reversed(list(self.images.items())):
+            if image_state.visible and image_state.hit_test(x, y):
+                return name
+        return None
+
+    def on_pick_click(self, event):
+        """
+        Makes the image under the cursor the active image (Shift+click).
+        """
+        name = self.pick_image(event.x, event.y)
+        if name is not None and name != self.active_image_name:
+            self.active_image_var.set(name)
+            self.change_active_image(name)
 
     def on_mouse_wheel(self, event):
         """
@@ -1182,17 +2060,49 @@ class ImageOverlayApp:
             return
 
         delta = self.get_mouse_wheel_delta(event)
-        old_scale = active_image.scale
-        active_image.scale_log += delta * 0.05  # Reduce sensitivity
-        active_image.scale = pow(2, active_image.scale_log)
+        self.accumulate_pointer_input(active_image.name, scale_log=delta * 0.05)  # Reduce sensitivity
 
-        # Limit scale
-        active_image.scale = max(0.1, min(active_image.scale, 10.0))
-        active_image.scale_log = math.log2(active_image.scale)
+        self.begin_interaction()
+        self.request_render()
 
-        logging.debug(f"Zooming image '{active_image.name}' to scale {active_image.scale}.")
+    def accumulate_pointer_input(self, name, **deltas):
+        """
+        Adds the deltas of a pointer event to the input accumulator. Deltas
+        still pending for another image are applied first.
+        """
+        if not self.input_accumulator.add(name, **deltas):
+            self.apply_pointer_input()
+            self.input_accumulator.add(name, **deltas)
 
-        self.draw_images()
+    def apply_pointer_input(self):
+        """
+        Applies the pointer input accumulated since the last frame to its
+        image.
+        """
+        pending = self.input_accumulator.take()
+        if pending is None:
+            return
+        name, (dx, dy, angle, scale_log), event_time = pending
+        image_state = self.images.get(name)
+        if image_state is None:
+            return
+        if event_time is not None:
+            self.command_queue.record_latency(event_time)
+        if dx or dy:
+            image_state.offset_x += dx
+            image_state.offset_y += dy
+            self.burst_log.record("Moved", name, math.hypot(dx, dy), "px")
+        if angle:
+            image_state.angle = (image_state.angle + angle) % 360  # Keep angle within 0-360 degrees
+            self.burst_log.record("Rotated", name, angle, "degrees")
+        if scale_log:
+            image_state.scale_log += scale_log
+            image_state.scale = pow(2, image_state.scale_log)
+
+            # Limit scale
+            image_state.scale = max(0.1, min(image_state.scale, 10.0))
+            image_state.scale_log = math.log2(image_state.scale)
+            self.burst_log.record("Zoomed", name, scale_log, "log2 scale")
 
     def get_mouse_wheel_delta(self, event):
         """
@@ -1216,6 +2126,9 @@ class ImageOverlayApp:
         if not active_image:
             return
 
+        # Pending drag or zoom input must not land on top of the reset
+        self.apply_pointer_input()
+
         # Reset transformations
         active_image.angle = 0
         active_image.scale = 1.0
@@ -1236,9 +2149,9 @@ class ImageOverlayApp:
         self.is_rotation_point_mode = False
         self.btn_set_rotation_point.config(text="Set Rot Pt")
 
-        self.draw_images()
+        self.request_render()
 
-        logging.info(f"Reset transformations for image '{active_image.name}'.")
+        logging.info("Reset transformations for image '%s'.", active_image.name)
 
     ####################################################################################################################################################################################
     ###                                                             --- Image Transformation ---                                                                                    ###
@@ -1252,8 +2165,8 @@ class ImageOverlayApp:
             return
         active_image.scale = min(active_image.scale + 0.05, 10.0)
         active_image.scale_log = math.log2(active_image.scale)
-        logging.info(f"Zoomed in on image '{active_image.name}' to scale {active_image.scale}.")
-        self.draw_images()
+        self.burst_log.record("Zoomed in", active_image.name, 0.05, "scale")
+        self.request_render()
 
     def zoom_out(self):
         """
@@ -1264,8 +2177,8 @@ class ImageOverlayApp:
             return
         active_image.scale = max(active_image.scale - 0.05, 0.1)
         active_image.scale_log = math.log2(active_image.scale)
-        logging.info(f"Zoomed out on image '{active_image.name}' to scale {active_image.scale}.")
-        self.draw_images()
+        self.burst_log.record("Zoomed out", active_image.name, 0.05, "scale")
+        self.request_render()
 
     def fine_zoom_in(self):
         """
@@ -1276,8 +2189,8 @@ class ImageOverlayApp:
             return
         active_image.scale = min(active_image.scale + 0.01, 10.0)
         active_image.scale_log = math.log2(active_image.scale)
-        logging.info(f"Fine zoomed in on image '{active_image.name}' to scale {active_image.scale}.")
-        self.draw_images()
+        self.burst_log.record("Fine zoomed in", active_image.name, 0.01, "scale")
+        self.request_render()
 
     def fine_zoom_out(self):
         """
@@ -1288,8 +2201,8 @@ class ImageOverlayApp:
             return
         active_image.scale = max(active_image.scale - 0.01, 0.1)
         active_image.scale_log = math.log2(active_image.scale)
-        logging.info(f"Fine zoomed out on image '{active_image.name}' to scale {active_image.scale}.")
-        self.draw_images()
+        self.burst_log.record("Fine zoomed out", active_image.name, 0.01, "scale")
+        self.request_render()
 
     def flip_image_horizontal(self):
         """
@@ -1299,8 +2212,8 @@ class ImageOverlayApp:
         if not active_image:
             return
         active_image.is_flipped_horizontally = not active_image.is_flipped_horizontally
-        logging.info(f"Image '{active_image.name}' flipped horizontally.")
-        self.draw_images()
+        logging.info("Image '%s' flipped horizontally.", active_image.name)
+        self.request_render()
 
     def flip_image_vertical(self):
         """
@@ -1310,8 +2223,8 @@ class ImageOverlayApp:
         if not active_image:
             return
         active_image.is_flipped_vertically = not active_image.is_flipped_vertically
-        logging.info(f"Image '{active_image.name}' flipped vertically.")
-        self.draw_images()
+        logging.info("Image '%s' flipped vertically.", active_image.name)
+        self.request_render()
 
     def toggle_rotation_point_mode(self):
         """
@@ -1329,7 +2242,7 @@ class ImageOverlayApp:
             self.btn_set_rotation_point.config(text="Set Rot Pt")
             active_image.rotation_point = None
             logging.info("Rotation point mode disabled and rotation point reset.")
-            self.draw_images()
+            self.request_render()
 
     ####################################################################################################################################################################################
     ###                                                             --- Fine Rotation Control Methods ---                                                                            ###
@@ -1342,8 +2255,8 @@ class ImageOverlayApp:
         if not active_image:
             return
         active_image.angle = (active_image.angle + 0.5) % 360
-        logging.info(f"Rotated image '{active_image.name}' clockwise by 0.5 degrees.")
-        self.draw_images()
+        self.burst_log.record("Rotated", active_image.name, 0.5, "degrees")
+        self.request_render()
 
     def fine_rotate_counterclockwise(self):
         """
@@ -1353,8 +2266,8 @@ class ImageOverlayApp:
         if not active_image:
             return
         active_image.angle = (active_image.angle - 0.5) % 360
-        logging.info(f"Rotated image '{active_image.name}' counterclockwise by 0.5 degrees.")
-        self.draw_images()
+        self.burst_log.record("Rotated", active_image.name, -0.5, "degrees")
+        self.request_render()
 
     ####################################################################################################################################################################################
     ###                                                             --- Centering Methods ---                                                                                       ###
@@ -1485,94 +2398,122 @@ class ImageOverlayApp:
             self.keyboard_listener.stop()
             self.keyboard_listener = None
             logging.info("Global key capture stopped.")
+        self.key_tracker.clear()
+        if self.motion_job is not None:
+            self.canvas.after_cancel(self.motion_job)
+            self.motion_job = None
 
     def on_global_key_press(self, key):
         """
-        Handles global key press events.
+        Handles global key press events. Motion keys only update the key
+        state; the motion itself runs on the Tk thread, so OS key repeats
+        do not queue up steps.
         """
-        try:
-            if key.char == 'w':
-                self.move_image('up')
-            elif key.char == 's':
-                self.move_image('down')
-            elif key.char == 'a':
-                self.move_image('left')
-            elif key.char == 'd':
-                self.move_image('right')
-            elif key.char == 'c':
-                self.rotate_image(-0.5)
-            elif key.char == 'z':
-                self.rotate_image(0.5)
-            elif key.char == 'x':
-                self.toggle_rotation_point_mode_thread_safe()
-            elif key.char == 'q':
-                self.fine_zoom_out_thread_safe()
-            elif key.char == 'e' and self.alt_pressed:
-                self.fine_zoom_in_thread_safe()
-            elif key.char == 'r' and all([keyboard.Key.ctrl_l, keyboard.Key.alt_l, keyboard.Key.shift]):
-                # This condition may not correctly capture Ctrl+Alt+Shift+R
-                # It's better to rely on the GlobalHotKeys for the reset
-                pass
-        except AttributeError:
+        char, vk = self.key_identity(key)
+        if char is None:
             # Handle special keys
             if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-                self.alt_pressed = True
+                self.key_tracker.press('alt')
+            return
+        if char in MOTION_KEYS:
+            if char == 'e' and not self.key_tracker.is_held('alt'):
+                return
+            if self.key_tracker.press(char, vk):
+                self.command_queue.post(self.on_motion_key_down, char, merge=True)
+        elif char == 'x':
+            if self.key_tracker.press(char, vk):
+                self.command_queue.post(self.toggle_rotation_point_mode)
+        elif char == 'r' and all([keyboard.Key.ctrl_l, keyboard.Key.alt_l, keyboard.Key.shift]):
+            # This condition may not correctly capture Ctrl+Alt+Shift+R
+            # It's better to rely on the GlobalHotKeys for the reset
+            pass
 
     def on_global_key_release(self, key):
         """
         Handles global key release events.
         """
         if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-            self.alt_pressed = False
+            self.key_tracker.release('alt')
+        char, vk = self.key_identity(key)
+        if char is not None or vk is not None:
+            self.key_tracker.release(char, vk)
 
-    def rotate_image(self, angle_increment):
+    @staticmethod
+    def key_identity(key):
         """
-        Rotates the active image by the given angle increment.
+        Returns the (char, vk) a key is tracked under. The char is lower-cased
+        so Shift and Caps Lock do not change it; the vk stays the same when
+        Option or AltGr composes a different char.
         """
-        self.canvas.after(0, self._rotate_image_main_thread, angle_increment)
-
-    def _rotate_image_main_thread(self, angle_increment):
-        active_image = self.get_active_image()
-        if not active_image:
-            return
-        active_image.angle = (active_image.angle + angle_increment) % 360
-        logging.info(f"Rotated image '{active_image.name}' by {angle_increment} degrees.")
-        self.draw_images()
-
-    def fine_zoom_in_thread_safe(self):
-        self.canvas.after(0, self.fine_zoom_in)
-
-    def fine_zoom_out_thread_safe(self):
-        self.canvas.after(0, self.fine_zoom_out)
-
-    def toggle_rotation_point_mode_thread_safe(self):
-        self.canvas.after(0, self.toggle_rotation_point_mode)
+        char = getattr(key, 'char', None)
+        return (char.lower() if char else None), getattr(key, 'vk', None)
 
-    def move_image(self, direction):
+    def on_motion_key_down(self, char):
         """
-        Moves the active image in the specified direction.
+        Nudges the active image by one step for a newly pressed motion key and
+        starts the motion loop if it is not running.
         """
-        self.canvas.after(0, self._move_image_main_thread, direction)
-
-    def _move_image_main_thread(self, direction):
         active_image = self.get_active_image()
         if not active_image:
             return
+        axis, direction = MOTION_KEYS[char]
+        step = MOTION_PROFILES['move' if axis in ('x', 'y') else axis][0] * direction
+        if axis == 'zoom':
+            # The step is linear like the zoom buttons; the accumulator takes log2
+            step = math.log2(min(max(active_image.scale + step, 0.1), 10.0) / active_image.scale)
+        self.accumulate_pointer_input(
+            active_image.name, event_time=self.command_queue.event_time, **self.motion_deltas({axis: step})
+        )
+        self.begin_interaction()
+        self.request_render()
+        if self.motion_job is None:
+            self.motion_last_tick = time.perf_counter()
+            self.motion_job = self.canvas.after(MOTION_TICK_MS, self.run_motion)
+
+    def run_motion(self):
+        """
+        Moves the active image for the keys held past MOTION_HOLD_DELAY, at a
+        speed that grows with how long each key has been held. Runs once per
+        tick until no motion key is held.
+        """
+        self.motion_job = None
+        self.key_tracker.expire(MOTION_KEY_TIMEOUT)
+        held = {key: pressed for key, pressed in self.key_tracker.held_keys().items() if key in MOTION_KEYS}
+        if not held or not self.control_mode:
+            return
+        now = time.perf_counter()
+        elapsed = min(now - self.motion_last_tick, 0.1)  # Do not jump after a stall
+        self.motion_last_tick = now
+
+        motion = {}
+        for key, pressed in held.items():
+            held_for = now - pressed - MOTION_HOLD_DELAY
+            if held_for <= 0:
+                continue
+            axis, direction = MOTION_KEYS[key]
+            _, start_speed, top_speed, acceleration = MOTION_PROFILES['move' if axis in ('x', 'y') else axis]
+            speed = min(top_speed, start_speed + acceleration * held_for)
+            motion[axis] = motion.get(axis, 0.0) + direction * speed * elapsed
 
-        move_amount = 3  # Pixels to move per key press
-
-        if direction == 'up':
-            active_image.offset_y -= move_amount
-        elif direction == 'down':
-            active_image.offset_y += move_amount
-        elif direction == 'left':
-            active_image.offset_x -= move_amount
-        elif direction == 'right':
-            active_image.offset_x += move_amount
-
-        logging.info(f"Moved image '{active_image.name}' {direction} by {move_amount} pixels.")
+        active_image = self.get_active_image()
+        if motion and active_image:
+            self.accumulate_pointer_input(active_image.name, **self.motion_deltas(motion))
+            self.motion_ticks += 1
+            self.begin_interaction()
+            self.request_render()
+        self.motion_job = self.canvas.after(MOTION_TICK_MS, self.run_motion)
 
-        self.draw_images()
+    @staticmethod
+    def motion_deltas(motion):
+        """
+        Converts per-axis motion to input accumulator deltas.
+        """
+        return {
+            'dx': motion.get('x', 0.0),
+            'dy': motion.get('y', 0.0),
+            'angle': motion.get('rotate', 0.0),
+            'scale_log': motion.get('zoom', 0.0),
+        }
 
     ####################################################################################################################################################################################
     ###                                                             --- Application Exit Method ---                                                                                  ###
@@ -1590,6 +2531,27 @@ class ImageOverlayApp:
         # Stop global hotkey listener
         if hasattr(self, 'global_hotkey_listener'):
             self.global_hotkey_listener.stop()
+        # Stop scheduling redraws and the render worker
+        self.burst_log.flush()
+        self.command_queue.stop()
+        self.render_scheduler.stop()
+        self.render_worker.stop()
+        self.vector_executor.shutdown(wait=False)
+        self.decode_executor.shutdown(wait=False, cancel_futures=True)
+        self.template_preloader.stop()
+        logging.info(f"Render scheduler stats: {self.render_scheduler.stats()}")
+        logging.info(f"Pointer input stats: {self.input_accumulator.stats()}")
+        logging.info(f"Control key stats: {dict(self.key_tracker.stats(), motion_ticks=self.motion_ticks)}")
+        logging.info(f"Command queue stats: {self.command_queue.stats()}")
+        logging.info(f"Template preloader stats: {self.template_preloader.stats()}")
+        logging.info(f"PhotoImage stats: {self.get_photo_stats()}")
+        logging.info(f"Render cache stats: {self.get_render_cache_stats()}")
+        logging.info(
+            f"Render worker stats: superseded={self.render_worker.superseded}, "
+            f"stale_results={self.stale_results}, failures={self.render_failures}"
+        )
+        if self.compositor is not None:
+            logging.info(f"Frame compositor stats: {self.compositor.stats()}")
         self.root.destroy()
         sys.exit(0)
 
@@ -1607,11 +2569,15 @@ class ImageOverlayApp:
             filetypes=[("Image Files", "*.jpg;*.jpeg;*.png;*.bmp;*.svg")]
         )
         if filepath:
-            image_original = self.open_image_file(filepath)
+            dialog_closed = time.perf_counter()
+            image_original, full_size, full_decode = self.open_user_image(filepath)
+            decode_time = time.perf_counter() - dialog_closed
             if image_original:
                 # Prompt user for a unique image name
                 default_name = os.path.splitext(os.path.basename(filepath))[0]
                 image_name = simpledialog.askstring("Image Name", "Enter a unique name for the image:", initialvalue=default_name)
+                # Time spent typing the name is not part of the load latency
+                name_entered = time.perf_counter()
                 if image_name:
                     # Ensure the name is unique
                     original_name = image_name
@@ -1620,18 +2586,25 @@ class ImageOverlayApp:
                         image_name = f"{original_name}_{counter}"
                         counter += 1
                     # Create and store the image state
-                    image_state = ImageState(image_original, image_name)
+                    image_state = ImageState(image_original, image_name, filepath, full_size)
                     self.images[image_name] = image_state
+                    self.load_timers[image_state] = (decode_time, name_entered)
+                    if full_decode is not None:
+                        full_decode.add_done_callback(
+                            lambda f: self.canvas.after(0, self.on_full_decode_ready, image_state, f)
+                        )
                     self.active_image_name = image_name
                     self.update_active_image_menu()
                     self.active_image_var.set(image_name)
-                    self.draw_images()
+                    self.request_render()
 
                     logging.info(f"User-loaded image '{image_name}' loaded from '{filepath}'.")
 
                     if not self.image_window_visible:
                         self.toggle_image_window()
                 else:
+                    if full_decode is not None:
+                        full_decode.cancel()
                     messagebox.showwarning("Name Required", "Image name is required to load the image.")
             else:
                 messagebox.showerror("Load Failed", "Failed to load the selected image.")
@@ -1641,16 +2614,10 @@ class ImageOverlayApp:
     ####################################################################################################################################################################################
     def reset_app(self):
         """
-        Resets the application to its initial state.
+        Resets the application to its initial state. Must run on the main
+        thread; the global hotkey posts it through the command queue.
         """
         logging.info("Resetting application to initial state.")
-        # Ensure the reset is executed on the main thread
-        self.root.after(0, self._reset_app_main_thread)
-
-    def _reset_app_main_thread(self):
-        """
-        Performs the actual reset of the application on the main thread.
-        """
         # Stop control mode if active
         if self.control_mode:
             self.toggle_control_mode()
@@ -1694,7 +2661,7 @@ class ImageOverlayApp:
         self.btn_set_rotation_point.config(text="Set Rot Pt")
 
         # Clear the canvas
-        self.draw_images()
+        self.request_render()
 
         logging.info("Application reset completed.")
 
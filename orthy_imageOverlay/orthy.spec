@@ -3,7 +3,7 @@
 
 a = Analysis(
     ['orthy.py'],
-    pathex=[],
+    pathex=['..'],
     binaries=[],
     datas=[('Images', 'Images')],
     hiddenimports=[],